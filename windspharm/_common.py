@@ -20,6 +20,9 @@
 # THE SOFTWARE.
 from __future__ import absolute_import
 
+import functools
+from math import prod
+
 import numpy as np
 from spharm import gaussian_lats_wts
 
@@ -55,10 +58,66 @@ def get_apiorder(ndim, latitude_dim, longitude_dim):
     apiorder.remove(longitude_dim)
     apiorder.insert(0, latitude_dim)
     apiorder.insert(1, longitude_dim)
-    reorder = [apiorder.index(i) for i in range(ndim)]
+    # The reordering is the inverse of the permutation apiorder.
+    reorder = [0] * ndim
+    for new_position, old_position in enumerate(apiorder):
+        reorder[old_position] = new_position
     return apiorder, reorder
 
 
+@functools.lru_cache(maxsize=32)
+def gaussian_latitudes(nlat):
+    """
+    Latitudes of a Gaussian grid, cached since they are computed
+    iteratively.
+
+    **Argument:**
+
+    *nlat*
+        Number of latitudes.
+
+    **Returns:**
+
+    *latitudes*
+        A read-only array of the Gaussian latitudes, ordered
+        north-to-south.
+
+    """
+    latitudes, _ = gaussian_lats_wts(nlat)
+    latitudes.flags.writeable = False
+    return latitudes
+
+
+@functools.lru_cache(maxsize=32)
+def regular_latitudes(nlat):
+    """
+    Latitudes of a global equally-spaced grid, cached for reuse.
+
+    **Argument:**
+
+    *nlat*
+        Number of latitudes. An odd number of latitudes includes the
+        poles, an even number does not.
+
+    **Returns:**
+
+    *latitudes*
+        A read-only array of the latitudes, ordered north-to-south.
+
+    """
+    if nlat % 2:
+        # Odd number of latitudes includes the poles.
+        latitudes = np.linspace(90, -90, nlat)
+    else:
+        # Even number of latitudes doesn't include the poles.
+        delta_latitude = 180. / nlat
+        latitudes = np.linspace(90 - 0.5 * delta_latitude,
+                                -90 + 0.5 * delta_latitude,
+                                nlat)
+    latitudes.flags.writeable = False
+    return latitudes
+
+
 def inspect_gridtype(latitudes):
     """
     Determine a grid type by examining the points of a latitude
@@ -83,32 +142,21 @@ def inspect_gridtype(latitudes):
     tolerance = 5e-4
     # Get the number of latitude points in the dimension.
     nlat = len(latitudes)
-    diffs = np.abs(np.diff(latitudes))
-    equally_spaced = (np.abs(diffs - diffs[0]) < tolerance).all()
+    # The spacing is equal if the largest and smallest spacings agree.
+    equally_spaced = np.ptp(np.abs(np.diff(latitudes))) < tolerance
     if not equally_spaced:
         # The latitudes are not equally-spaced, which suggests they might
-        # be gaussian. Construct sample gaussian latitudes and check if
-        # the two match.
-        gauss_reference, wts = gaussian_lats_wts(nlat)
-        difference = np.abs(latitudes - gauss_reference)
-        if (difference > tolerance).any():
+        # be gaussian. Check if they match the (cached) gaussian latitudes.
+        gauss_reference = gaussian_latitudes(nlat)
+        if np.abs(latitudes - gauss_reference).max() > tolerance:
             raise ValueError('latitudes are neither equally-spaced '
                              'or Gaussian')
         gridtype = 'gaussian'
     else:
-        # The latitudes are equally-spaced. Construct reference global
-        # equally spaced latitudes and check that the two match.
-        if nlat % 2:
-            # Odd number of latitudes includes the poles.
-            equal_reference = np.linspace(90, -90, nlat)
-        else:
-            # Even number of latitudes doesn't include the poles.
-            delta_latitude = 180. / nlat
-            equal_reference = np.linspace(90 - 0.5 * delta_latitude,
-                                          -90 + 0.5 * delta_latitude,
-                                          nlat)
-        difference = np.abs(latitudes - equal_reference)
-        if (difference > tolerance).any():
+        # The latitudes are equally-spaced. Check that they match the
+        # reference global equally spaced latitudes.
+        equal_reference = regular_latitudes(nlat)
+        if np.abs(latitudes - equal_reference).max() > tolerance:
             raise ValueError('equally-spaced latitudes are invalid '
                              '(they may be non-global)')
         gridtype = 'regular'
@@ -116,5 +164,66 @@ def inspect_gridtype(latitudes):
 
 
 def to3d(array):
-    new_shape = array.shape[:2] + (np.prod(array.shape[2:], dtype=int),)
+    new_shape = array.shape[:2] + (prod(array.shape[2:]),)
     return array.reshape(new_shape)
+
+
+# Names of the diagnostics available from get_diagnostics.
+DIAGNOSTICS = ('vrt', 'div', 'sf', 'vp', 'uchi', 'vchi', 'upsi', 'vpsi')
+
+
+def get_diagnostics(vectorwind, truncation=None, which=None):
+    """
+    Compute a set of diagnostics from a VectorWind instance.
+
+    The diagnostics are computed with the methods of *vectorwind*, which
+    share spectral analyses of the wind, so the wind is only analysed
+    once however many diagnostics are requested.
+
+    **Arguments:**
+
+    *vectorwind*
+        A VectorWind instance from any of the windspharm interfaces.
+
+    **Optional arguments:**
+
+    *truncation*
+        Truncation limit (triangular truncation) for the spherical
+        harmonic computation.
+
+    *which*
+        A diagnostic name or an iterable of diagnostic names, a subset
+        of `DIAGNOSTICS`. Defaults to all diagnostics.
+
+    **Returns:**
+
+    *diagnostics*
+        A dictionary mapping each name in *which* to its diagnostic.
+
+    """
+    if which is None:
+        which = DIAGNOSTICS
+    elif isinstance(which, str):
+        which = (which,)
+    else:
+        which = tuple(which)
+        unknown = [name for name in which if name not in DIAGNOSTICS]
+        if unknown:
+            raise ValueError('unknown diagnostics: {!s}'.format(
+                ', '.join(unknown)))
+    results = {}
+    if 'vrt' in which:
+        results['vrt'] = vectorwind.vorticity(truncation=truncation)
+    if 'div' in which:
+        results['div'] = vectorwind.divergence(truncation=truncation)
+    if 'sf' in which:
+        results['sf'] = vectorwind.streamfunction(truncation=truncation)
+    if 'vp' in which:
+        results['vp'] = vectorwind.velocitypotential(truncation=truncation)
+    if 'uchi' in which or 'vchi' in which:
+        uchi, vchi = vectorwind.irrotationalcomponent(truncation=truncation)
+        results.update(uchi=uchi, vchi=vchi)
+    if 'upsi' in which or 'vpsi' in which:
+        upsi, vpsi = vectorwind.nondivergentcomponent(truncation=truncation)
+        results.update(upsi=upsi, vpsi=vpsi)
+    return {name: results[name] for name in which}
@@ -24,7 +24,8 @@ from iris.cube import Cube
 from iris.util import reverse
 
 from . import standard
-from ._common import get_apiorder, inspect_gridtype, to3d
+from ._common import (get_apiorder, get_diagnostics, inspect_gridtype,
+                      to3d)
 
 
 class VectorWind(object):
@@ -68,6 +69,9 @@ class VectorWind(object):
         # Make sure inputs are Iris cubes.
         if type(u) is not Cube or type(v) is not Cube:
             raise TypeError('u and v must be iris cubes')
+        # If the same cube is given for both components then it only needs
+        # to be prepared once.
+        same_components = v is u
         # Get the coordinates of each component and make sure they are the
         # same.
         ucoords = u.dim_coords
@@ -81,7 +85,7 @@ class VectorWind(object):
         if (lat.points[0] < lat.points[1]):
             # need to reverse latitude dimension
             u = reverse(u, lat_dim)
-            v = reverse(v, lat_dim)
+            v = u if same_components else reverse(v, lat_dim)
             lat, lat_dim = _dim_coord_and_dim(u, 'latitude')
         # Determine the grid type of the input.
         gridtype = inspect_gridtype(lat.points)
@@ -92,15 +96,18 @@ class VectorWind(object):
         # Re-order the inputs (in-place, so we take a copy first) so latiutude
         # and longitude are at the front.
         u = u.copy()
-        v = v.copy()
         u.transpose(apiorder)
-        v.transpose(apiorder)
+        if same_components:
+            v = u
+        else:
+            v = v.copy()
+            v.transpose(apiorder)
         # Records the current shape and dimension coordinates of the inputs.
         self._ishape = u.shape
-        self._coords = u.dim_coords
+        self._coords_and_dims = list(zip(u.dim_coords, range(u.ndim)))
         # Reshape the inputs so they are compatible with pyspharm.
         u = to3d(u.data)
-        v = to3d(v.data)
+        v = u if same_components else to3d(v.data)
         # Create a base VectorWind instance to do the computations.
         self._api = standard.VectorWind(u, v, gridtype=gridtype,
                                         rsphere=rsphere, legfunc=legfunc)
@@ -108,9 +115,7 @@ class VectorWind(object):
     def _metadata(self, var, **attributes):
         """Re-shape outputs and add meta-data."""
         var = var.reshape(self._ishape)
-        var = Cube(
-            var,
-            dim_coords_and_dims=list(zip(self._coords, range(var.ndim))))
+        var = Cube(var, dim_coords_and_dims=self._coords_and_dims)
         var.transpose(self._reorder)
         for attribute, value in attributes.items():
             setattr(var, attribute, value)
@@ -309,7 +314,8 @@ class VectorWind(object):
         **Returns:**
 
         *pvorticity*
-            The planetary vorticity.
+            The planetary vorticity. This has the same precision as
+            the input winds (double precision for integer winds).
 
         **See also:**
 
@@ -350,7 +356,9 @@ class VectorWind(object):
         **Returns:**
 
         *avorticity*
-            The absolute (relative + planetary) vorticity.
+            The absolute (relative + planetary) vorticity. This is
+            single precision for single precision input winds and
+            double precision otherwise.
 
         **See also:**
 
@@ -633,6 +641,49 @@ class VectorWind(object):
                               long_name='non_divergent_northward_wind')
         return upsi, vpsi
 
+    def diagnostics(self, truncation=None, which=None):
+        """Several diagnostics computed from one analysis of the wind.
+
+        **Optional arguments:**
+
+        *truncation*
+            Truncation limit (triangular truncation) for the spherical
+            harmonic computation.
+
+        *which*
+            The name of a diagnostic, or an iterable containing the
+            names of the diagnostics to compute, any of 'vrt'
+            (relative vorticity), 'div' (divergence), 'sf'
+            (streamfunction), 'vp' (velocity potential), 'uchi', 'vchi'
+            (irrotational components), 'upsi' and 'vpsi' (non-divergent
+            components). Defaults to all of these diagnostics.
+
+        **Returns:**
+
+        *diagnostics*
+            A dictionary mapping each requested name to an `~iris.cube.Cube`.
+
+        **See also:**
+
+        `~VectorWind.vrtdiv`, `~VectorWind.sfvp`,
+        `~VectorWind.helmholtz`.
+
+        **Examples:**
+
+        Compute all the diagnostics::
+
+            diags = w.diagnostics()
+            vrt = diags['vrt']
+
+        Compute the streamfunction and the non-divergent wind components
+        with spectral truncation at triangular T13::
+
+            diags = w.diagnostics(truncation=13,
+                                  which=('sf', 'upsi', 'vpsi'))
+
+        """
+        return get_diagnostics(self, truncation=truncation, which=which)
+
     def gradient(self, chi, truncation=None):
         """Computes the vector gradient of a scalar field on the sphere.
 
@@ -678,22 +729,17 @@ class VectorWind(object):
         if (lat.points[0] < lat.points[1]):
             # need to reverse latitude dimension
             chi = reverse(chi, lat_dim)
-            lat, lat_dim = _dim_coord_and_dim(chi, 'latitude')
         apiorder, reorder = get_apiorder(chi.ndim, lat_dim, lon_dim)
         chi = chi.copy()
         chi.transpose(apiorder)
         ishape = chi.shape
-        coords = chi.dim_coords
+        coords_and_dims = list(zip(chi.dim_coords, range(chi.ndim)))
         chi = to3d(chi.data)
         uchi, vchi = self._api.gradient(chi, truncation=truncation)
         uchi = uchi.reshape(ishape)
         vchi = vchi.reshape(ishape)
-        uchi = Cube(
-            uchi,
-            dim_coords_and_dims=list(zip(coords, range(uchi.ndim))))
-        vchi = Cube(
-            vchi,
-            dim_coords_and_dims=list(zip(coords, range(vchi.ndim))))
+        uchi = Cube(uchi, dim_coords_and_dims=coords_and_dims)
+        vchi = Cube(vchi, dim_coords_and_dims=coords_and_dims)
         uchi.transpose(reorder)
         vchi.transpose(reorder)
         uchi.long_name = 'zonal_gradient_of_{!s}'.format(name)
@@ -745,7 +791,6 @@ class VectorWind(object):
         if (lat.points[0] < lat.points[1]):
             # need to reverse latitude dimension
             field = reverse(field, lat_dim)
-            lat, lat_dim = _dim_coord_and_dim(field, 'latitude')
         apiorder, reorder = get_apiorder(field.ndim, lat_dim, lon_dim)
         field = field.copy()
         field.transpose(apiorder)
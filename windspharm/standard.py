@@ -18,12 +18,55 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
+import weakref
+
 import numpy as np
-from spharm import Spharmt, gaussian_lats_wts
+from spharm import Spharmt, getspecindx
+
+from ._common import gaussian_latitudes, get_diagnostics, regular_latitudes
+
+
+# Spharmt instances currently in use, keyed by grid definition. Entries
+# are removed automatically once no VectorWind refers to them, so the
+# (potentially very large) stored Legendre functions are not kept alive.
+_spharmt_instances = weakref.WeakValueDictionary()
+
+
+def _get_spharmt(nlon, nlat, gridtype, rsphere, legfunc):
+    """
+    Return a `spharm.Spharmt` instance for the given grid.
+
+    Instances are shared while in use, so `VectorWind` instances created
+    on the same grid share one `spharm.Spharmt` and the set-up cost
+    (including precomputing associated Legendre functions when *legfunc*
+    is 'stored') is only paid once. `spharm.Spharmt` instances are not
+    modified after creation, so sharing them is safe.
+
+    """
+    try:
+        key = (nlon, nlat, gridtype, float(rsphere), legfunc)
+    except (TypeError, ValueError):
+        # Leave reporting an unusable radius to spharm.
+        return Spharmt(nlon, nlat, gridtype=gridtype, rsphere=rsphere,
+                       legfunc=legfunc)
+    s = _spharmt_instances.get(key)
+    if s is None:
+        s = Spharmt(nlon, nlat, gridtype=gridtype, rsphere=rsphere,
+                    legfunc=legfunc)
+        _spharmt_instances[key] = s
+    return s
 
 
 class VectorWind(object):
-    """Vector Wind computations (standard `numpy` interface)."""
+    """Vector Wind computations (standard `numpy` interface).
+
+    The spherical harmonic set-up (a `spharm.Spharmt` instance) is shared
+    between `VectorWind` instances with the same grid, radius and
+    *legfunc*, so creating several instances on the same grid only pays
+    the set-up cost once. It is only shared while at least one such
+    `VectorWind` instance is alive, after that it is freed.
+
+    """
 
     def __init__(self, u, v, gridtype='regular', rsphere=6.3712e6,
                  legfunc='stored'):
@@ -87,18 +130,21 @@ class VectorWind(object):
             w = VectorWind(u, v, gridtype='gaussian')
 
         """
-        # For both the input components check if there are missing values by
-        # attempting to fill missing values with NaN and detect them. If the
-        # inputs are not masked arrays then take copies and check for NaN.
-        try:
-            self.u = u.filled(fill_value=np.nan)
-        except AttributeError:
-            self.u = u.copy()
-        try:
-            self.v = v.filled(fill_value=np.nan)
-        except AttributeError:
-            self.v = v.copy()
-        if np.isnan(self.u).any() or np.isnan(self.v).any():
+        # Neither of the input components may contain missing values, either
+        # masked elements or NaN. Masks are checked directly, then copies of
+        # the underlying data are taken and checked for NaN. The components
+        # are stored in Fortran order, which is the layout the spherical
+        # harmonic routines use, so single precision input does not need a
+        # transposed copy for each transform (other types are still cast
+        # to single precision by the routines on every call).
+        # If the same array is given for both components it is only copied
+        # and checked once.
+        if np.ma.is_masked(u) or (v is not u and np.ma.is_masked(v)):
+            raise ValueError('u and v cannot contain missing values')
+        self.u = np.array(u, order='F')
+        self.v = self.u if v is u else np.array(v, order='F')
+        if np.isnan(self.u).any() or (self.v is not self.u and
+                                      np.isnan(self.v).any()):
             raise ValueError('u and v cannot contain missing values')
         # Make sure the shapes of the two components match.
         if u.shape != v.shape:
@@ -108,16 +154,23 @@ class VectorWind(object):
         nlat = u.shape[0]
         nlon = u.shape[1]
         try:
-            # Create a Spharmt object to do the computations.
+            # Get a (possibly shared) Spharmt object to do the computations.
             self.gridtype = gridtype.lower()
-            self.s = Spharmt(nlon, nlat, gridtype=self.gridtype,
-                             rsphere=rsphere, legfunc=legfunc)
+            self.s = _get_spharmt(nlon, nlat, self.gridtype, rsphere,
+                                  legfunc)
         except ValueError:
             if self.gridtype not in ('regular', 'gaussian'):
                 err = 'invalid grid type: {0:s}'.format(repr(gridtype))
             else:
                 err = 'invalid input dimensions'
             raise ValueError(err)
+        # Spectral results are cached per truncation so that calling
+        # several methods on the same instance (e.g. vorticity() and then
+        # divergence()) only performs the analysis of the wind once. Only
+        # spectral coefficients are kept, gridded results are synthesised
+        # on demand.
+        self._vrtdivspec_cache = {}
+        self._psichispec_cache = {}
         # Method aliases.
         self.rotationalcomponent = self.nondivergentcomponent
         self.divergentcomponent = self.irrotationalcomponent
@@ -137,7 +190,12 @@ class VectorWind(object):
             spd = w.magnitude()
 
         """
-        return (self.u ** 2 + self.v ** 2) ** 0.5
+        # Accumulate in place to limit the number of full-size temporaries,
+        # using a floating-point buffer so integer winds are supported.
+        speed = np.multiply(self.u, self.u,
+                            dtype=np.result_type(self.u, np.float32))
+        speed += np.multiply(self.v, self.v, dtype=speed.dtype)
+        return np.sqrt(speed, out=speed)
 
     def vrtdiv(self, truncation=None):
         """Relative vorticity and horizontal divergence.
@@ -169,9 +227,7 @@ class VectorWind(object):
             vrtT13, divT13 = w.vrtdiv(truncation=13)
 
         """
-        vrtspec, divspec = self.s.getvrtdivspec(self.u,
-                                                self.v,
-                                                ntrunc=truncation)
+        vrtspec, divspec = self._vrtdivspec(truncation)
         vrtgrid = self.s.spectogrd(vrtspec)
         divgrid = self.s.spectogrd(divspec)
         return vrtgrid, divgrid
@@ -206,9 +262,7 @@ class VectorWind(object):
             vrtT13 = w.vorticity(truncation=13)
 
         """
-        vrtspec, divspec = self.s.getvrtdivspec(self.u,
-                                                self.v,
-                                                ntrunc=truncation)
+        vrtspec, divspec = self._vrtdivspec(truncation)
         vrtgrid = self.s.spectogrd(vrtspec)
         return vrtgrid
 
@@ -242,9 +296,7 @@ class VectorWind(object):
             divT13 = w.divergence(truncation=13)
 
         """
-        vrtspec, divspec = self.s.getvrtdivspec(self.u,
-                                                self.v,
-                                                ntrunc=truncation)
+        vrtspec, divspec = self._vrtdivspec(truncation)
         divgrid = self.s.spectogrd(divspec)
         return divgrid
 
@@ -260,7 +312,8 @@ class VectorWind(object):
         **Returns:**
 
         *pvorticity*
-            The planetary vorticity.
+            The planetary vorticity. This has the same precision as
+            the input winds (double precision for integer winds).
 
         **See also:**
 
@@ -282,19 +335,18 @@ class VectorWind(object):
             omega = 7.292e-05
         nlat = self.s.nlat
         if self.gridtype == 'gaussian':
-            lat, wts = gaussian_lats_wts(nlat)
+            lat = gaussian_latitudes(nlat)
         else:
-            if nlat % 2:
-                lat = np.linspace(90, -90, nlat)
-            else:
-                dlat = 180. / nlat
-                lat = np.arange(90 - dlat / 2., -90, -dlat)
+            lat = regular_latitudes(nlat)
         try:
             cp = 2. * omega * np.sin(np.deg2rad(lat))
         except (TypeError, ValueError):
             raise ValueError('invalid value for omega: {!r}'.format(omega))
+        # Follow the precision of the input winds, so that single precision
+        # input does not produce double precision absolute vorticity.
         indices = [slice(0, None)] + [np.newaxis] * (len(self.u.shape) - 1)
-        f = cp[tuple(indices)] * np.ones(self.u.shape, dtype=np.float32)
+        f = np.broadcast_to(cp[tuple(indices)], self.u.shape).astype(
+            np.result_type(self.u, np.float32))
         return f
 
     def absolutevorticity(self, omega=None, truncation=None):
@@ -313,7 +365,9 @@ class VectorWind(object):
         **Returns:**
 
         *avorticity*
-            The absolute (relative + planetary) vorticity.
+            The absolute (relative + planetary) vorticity. This is
+            single precision for single precision input winds and
+            double precision otherwise.
 
         **See also:**
 
@@ -336,6 +390,39 @@ class VectorWind(object):
         rvrt = self.vorticity(truncation=truncation)
         return pvrt + rvrt
 
+    def _vrtdivspec(self, truncation):
+        """Cached spectral coefficients of vorticity and divergence."""
+        try:
+            return self._vrtdivspec_cache[truncation]
+        except KeyError:
+            spec = self.s.getvrtdivspec(self.u, self.v, ntrunc=truncation)
+            self._vrtdivspec_cache[truncation] = spec
+            return spec
+
+    def _psichispec(self, truncation):
+        """Cached spectral coefficients of streamfunction and velocity
+        potential.
+
+        These are computed from the cached spectral coefficients of
+        vorticity and divergence by inverting the Laplacian, the global
+        mean (n = 0) component is set to zero.
+
+        """
+        try:
+            return self._psichispec_cache[truncation]
+        except KeyError:
+            vrtspec, divspec = self._vrtdivspec(truncation)
+            ntrunc = self.s.nlat - 1 if truncation is None else truncation
+            indxn = getspecindx(ntrunc)[1]
+            invlap = np.zeros(indxn.shape, dtype=np.float32)
+            invlap[1:] = -self.s.rsphere ** 2 / (indxn[1:] *
+                                                 (indxn[1:] + 1.))
+            if vrtspec.ndim == 2:
+                invlap = invlap[:, np.newaxis]
+            spec = invlap * vrtspec, invlap * divspec
+            self._psichispec_cache[truncation] = spec
+            return spec
+
     def sfvp(self, truncation=None):
         """Streamfunction and velocity potential.
 
@@ -366,7 +453,9 @@ class VectorWind(object):
             sfT13, vpT13 = w.sfvp(truncation=13)
 
         """
-        psigrid, chigrid = self.s.getpsichi(self.u, self.v, ntrunc=truncation)
+        psispec, chispec = self._psichispec(truncation)
+        psigrid = self.s.spectogrd(psispec)
+        chigrid = self.s.spectogrd(chispec)
         return psigrid, chigrid
 
     def streamfunction(self, truncation=None):
@@ -399,7 +488,8 @@ class VectorWind(object):
             sfT13 = w.streamfunction(truncation=13)
 
         """
-        psigrid, chigrid = self.sfvp(truncation=truncation)
+        psispec, chispec = self._psichispec(truncation)
+        psigrid = self.s.spectogrd(psispec)
         return psigrid
 
     def velocitypotential(self, truncation=None):
@@ -432,7 +522,8 @@ class VectorWind(object):
             vpT13 = w.velocity potential(truncation=13)
 
         """
-        psigrid, chigrid = self.sfvp(truncation=truncation)
+        psispec, chispec = self._psichispec(truncation)
+        chigrid = self.s.spectogrd(chispec)
         return chigrid
 
     def helmholtz(self, truncation=None):
@@ -468,9 +559,7 @@ class VectorWind(object):
             uchiT13, vchiT13, upsiT13, vpsiT13 = w.helmholtz(truncation=13)
 
         """
-        psigrid, chigrid = self.s.getpsichi(self.u, self.v, ntrunc=truncation)
-        psispec = self.s.grdtospec(psigrid)
-        chispec = self.s.grdtospec(chigrid)
+        psispec, chispec = self._psichispec(truncation)
         vpsi, upsi = self.s.getgrad(psispec)
         uchi, vchi = self.s.getgrad(chispec)
         return uchi, vchi, -upsi, vpsi
@@ -511,8 +600,7 @@ class VectorWind(object):
             uchiT13, vchiT13 = w.irrotationalcomponent(truncation=13)
 
         """
-        psigrid, chigrid = self.s.getpsichi(self.u, self.v, ntrunc=truncation)
-        chispec = self.s.grdtospec(chigrid)
+        psispec, chispec = self._psichispec(truncation)
         uchi, vchi = self.s.getgrad(chispec)
         return uchi, vchi
 
@@ -552,11 +640,53 @@ class VectorWind(object):
             upsiT13, vpsiT13 = w.nondivergentcomponent(truncation=13)
 
         """
-        psigrid, chigrid = self.s.getpsichi(self.u, self.v, ntrunc=truncation)
-        psispec = self.s.grdtospec(psigrid)
+        psispec, chispec = self._psichispec(truncation)
         vpsi, upsi = self.s.getgrad(psispec)
         return -upsi, vpsi
 
+    def diagnostics(self, truncation=None, which=None):
+        """Several diagnostics computed from one analysis of the wind.
+
+        **Optional arguments:**
+
+        *truncation*
+            Truncation limit (triangular truncation) for the spherical
+            harmonic computation.
+
+        *which*
+            The name of a diagnostic, or an iterable containing the
+            names of the diagnostics to compute, any of 'vrt'
+            (relative vorticity), 'div' (divergence), 'sf'
+            (streamfunction), 'vp' (velocity potential), 'uchi', 'vchi'
+            (irrotational components), 'upsi' and 'vpsi' (non-divergent
+            components). Defaults to all of these diagnostics.
+
+        **Returns:**
+
+        *diagnostics*
+            A dictionary mapping each requested name to an array.
+
+        **See also:**
+
+        `~VectorWind.vrtdiv`, `~VectorWind.sfvp`,
+        `~VectorWind.helmholtz`.
+
+        **Examples:**
+
+        Compute all the diagnostics::
+
+            diags = w.diagnostics()
+            vrt = diags['vrt']
+
+        Compute the streamfunction and the non-divergent wind components
+        with spectral truncation at triangular T13::
+
+            diags = w.diagnostics(truncation=13,
+                                  which=('sf', 'upsi', 'vpsi'))
+
+        """
+        return get_diagnostics(self, truncation=truncation, which=which)
+
     def gradient(self, chi, truncation=None):
         """Computes the vector gradient of a scalar field on the sphere.
 
@@ -594,10 +724,9 @@ class VectorWind(object):
             avrt_zonalT13, avrt_meridionalT13 = w.gradient(avrt, truncation=13)
 
         """
-        try:
-            chi = chi.filled(fill_value=np.nan)
-        except AttributeError:
-            pass
+        if np.ma.is_masked(chi):
+            raise ValueError('chi cannot contain missing values')
+        chi = np.asarray(chi)
         if np.isnan(chi).any():
             raise ValueError('chi cannot contain missing values')
         try:
@@ -645,10 +774,9 @@ class VectorWind(object):
             scalar_field_T21 = w.truncate(scalar_field, truncation=21)
 
         """
-        try:
-            field = field.filled(fill_value=np.nan)
-        except AttributeError:
-            pass
+        if np.ma.is_masked(field):
+            raise ValueError('field cannot contain missing values')
+        field = np.asarray(field)
         if np.isnan(field).any():
             raise ValueError('field cannot contain missing values')
         try:
@@ -19,6 +19,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 from __future__ import absolute_import
+import functools
 import os
 
 import numpy as np
@@ -29,8 +30,9 @@ def test_data_path():
     return os.path.join(os.path.abspath(os.path.dirname(__file__)), 'data')
 
 
-def __read_reference_solutions(gridtype):
-    """Read reference solutions from file."""
+@functools.lru_cache(maxsize=None)
+def __load_reference_solutions(gridtype):
+    """Read reference solutions from file, once per grid type."""
     exact = dict()
     for varid in ('psi', 'chi', 'vrt', 'div', 'uchi', 'vchi', 'upsi', 'vpsi',
                   'chigradu', 'chigradv', 'uwnd', 'vwnd', 'vrt_trunc'):
@@ -41,9 +43,21 @@ def __read_reference_solutions(gridtype):
         except IOError:
             msg = 'required data file not found: {!s}'
             raise IOError(msg.format(filename))
+        # The cached arrays are shared by every caller.
+        exact[varid].flags.writeable = False
     return exact
 
 
+def __read_reference_solutions(gridtype):
+    """
+    Get reference solutions. The arrays are copies of the cached data,
+    so callers are free to modify them.
+
+    """
+    exact = __load_reference_solutions(gridtype)
+    return {varid: data.copy() for varid, data in exact.items()}
+
+
 def _wrap_iris(reference, lats, lons):
     try:
         from iris.cube import Cube
@@ -57,7 +71,7 @@ def _wrap_iris(reference, lats, lons):
     latdim = DimCoord(lats,
                       standard_name='latitude',
                       units='degrees_north')
-    coords = list(zip((latdim, londim), (0, 1)))
+    coords = [(latdim, 0), (londim, 1)]
     for name in reference.keys():
         reference[name] = Cube(reference[name],
                                dim_coords_and_dims=coords,
@@ -68,10 +82,7 @@ def _wrap_xarray(reference, lats, lons):
     try:
         import xarray as xr
     except ImportError:
-        try:
-            import xray as xr
-        except ImportError:
-            raise ValueError("cannot use container 'xarray' without xarray")
+        raise ValueError("cannot use container 'xarray' without xarray")
     londim = xr.IndexVariable('longitude', lons,
                               attrs={'standard_name': 'longitude',
                                      'units': 'degrees_east'})
@@ -52,8 +52,7 @@ class TestStandardErrorHandlers(ErrorHandlersTest):
     def test_masked_values(self):
         # masked values in inputs should raise an error
         solution = reference_solutions(self.interface, self.gridtype)
-        mask = np.empty(solution['uwnd'].shape, dtype=bool)
-        mask[:] = False
+        mask = np.zeros(solution['uwnd'].shape, dtype=bool)
         mask[1, 1] = True
         u = ma.array(solution['uwnd'], mask=mask, fill_value=1.e20)
         v = ma.array(solution['vwnd'], mask=mask, fill_value=1.e20)
@@ -72,10 +71,11 @@ class TestStandardErrorHandlers(ErrorHandlersTest):
     def test_invalid_shape_components(self):
         # invalid shape inputs should raise an error
         solution = reference_solutions(self.interface, self.gridtype)
+        shape = (2,) + solution['uwnd'].shape
         with pytest.raises(ValueError):
             solvers[self.interface](
-                solution['uwnd'][np.newaxis].repeat(2, axis=0),
-                solution['vwnd'][np.newaxis].repeat(2, axis=0),
+                np.broadcast_to(solution['uwnd'], shape),
+                np.broadcast_to(solution['vwnd'], shape),
                 gridtype=self.gridtype)
 
     def test_different_shape_components(self):
@@ -115,8 +115,7 @@ class TestStandardErrorHandlers(ErrorHandlersTest):
         solution = reference_solutions(self.interface, self.gridtype)
         vw = solvers[self.interface](solution['uwnd'], solution['vwnd'],
                                      gridtype=self.gridtype)
-        mask = np.empty(solution['uwnd'].shape, dtype=np.bool_)
-        mask[:] = False
+        mask = np.zeros(solution['uwnd'].shape, dtype=bool)
         mask[1, 1] = True
         chi = ma.array(solution['chi'], mask=mask, fill_value=1.e20)
         with pytest.raises(ValueError):
@@ -139,6 +138,14 @@ class TestStandardErrorHandlers(ErrorHandlersTest):
         with pytest.raises(ValueError):
             vw.gradient(solution['chi'][:-1])
 
+    def test_diagnostics_unknown_name(self):
+        # requesting an unknown diagnostic should raise an error
+        solution = reference_solutions(self.interface, self.gridtype)
+        vw = solvers[self.interface](solution['uwnd'], solution['vwnd'],
+                                     gridtype=self.gridtype)
+        with pytest.raises(ValueError):
+            vw.diagnostics(which=('vrt', 'pv'))
+
 
 # ----------------------------------------------------------------------------
 # Tests for the iris interface
@@ -251,6 +258,16 @@ class TestXarrayErrorHandlers(ErrorHandlersTest):
         with pytest.raises(ValueError):
             solvers[self.interface](solution['uwnd'], solution['vwnd'])
 
+    def test_non_monotonic_latitude(self):
+        # latitudes that are not monotonic should raise an error
+        solution = reference_solutions(self.interface, self.gridtype)
+        order = np.arange(solution['uwnd'].shape[0])
+        order[[1, 2]] = order[[2, 1]]
+        u = solution['uwnd'].isel(latitude=order)
+        v = solution['vwnd'].isel(latitude=order)
+        with pytest.raises(ValueError, match='monotonic'):
+            solvers[self.interface](u, v)
+
     def test_gradient_non_dataarray_input(self):
         # input to gradient not an xarray.DataArray should raise an error
         solution = reference_solutions(self.interface, self.gridtype)
@@ -20,6 +20,9 @@
 # THE SOFTWARE.
 from __future__ import absolute_import
 
+from collections import namedtuple
+import functools
+
 import numpy as np
 import pytest
 
@@ -27,360 +30,371 @@ from windspharm.tests import VectorWindTest, solvers
 from .reference import reference_solutions
 
 
-class SolutionTest(VectorWindTest):
-    """Base class for all solution test classes."""
-    interface = None
-    gridtype = None
-    radius = None
-    legfunc = None
-
-    @classmethod
-    def setup_class(cls):
-        msg = 'missing dependencies required to test the {!s} interface'
-        try:
-            cls.solution = reference_solutions(cls.interface, cls.gridtype)
-        except ValueError:
-            pytest.skip(msg.format(cls.interface))
-        cls.pre_modify_solution()
-        try:
-            # gridtype argument only available for the standard interface
-            kwargs = {}
-            if cls.interface == 'standard':
-                kwargs['gridtype'] = cls.gridtype
-            if cls.radius is not None:
-                kwargs['rsphere'] = cls.radius
-            if cls.legfunc is not None:
-                kwargs['legfunc'] = cls.legfunc
-            cls.vw = solvers[cls.interface](cls.solution['uwnd'],
-                                            cls.solution['vwnd'], **kwargs)
-        except KeyError:
-            pytest.skip(msg.format(cls.interface))
-        cls.post_modify_solution()
-
-    @classmethod
-    def pre_modify_solution(cls):
-        pass
-
-    @classmethod
-    def post_modify_solution(cls):
-        pass
-
-    def test_magnitude(self):
+#: Default radius of the sphere used by all interfaces.
+DEFAULT_RADIUS = 6.3712e6
+
+
+#: A single solution test configuration. *modifier* names an entry in
+#: `MODIFIERS`, *radius* and *legfunc* are passed to the solver when not
+#: `None`.
+Case = namedtuple('Case', ('interface', 'gridtype', 'modifier', 'radius',
+                           'legfunc'))
+
+
+def _singleton(solution):
+    """Add a singleton right-most dimension to every field."""
+    for field_name in solution:
+        solution[field_name] = solution[field_name][..., np.newaxis]
+
+
+def _multitime(solution):
+    """Repeat every field along a new right-most dimension."""
+    # Zero-copy broadcast views are sufficient, the solver takes its own
+    # copy of the wind components.
+    for field_name, field in solution.items():
+        solution[field_name] = np.broadcast_to(field[..., np.newaxis],
+                                               field.shape + (5,))
+
+
+def _transpose(solution):
+    """Swap the latitude and longitude dimensions of every field."""
+    for field_name in solution:
+        transposed = solution[field_name].transpose()
+        # iris cubes are transposed in-place and return None
+        if transposed is not None:
+            solution[field_name] = transposed
+
+
+def _invert_latitude(solution):
+    """Reverse the latitude dimension of the wind components."""
+    for field_name in ('uwnd', 'vwnd'):
+        solution[field_name] = solution[field_name][::-1]
+
+
+#: Modifications applied to the reference solution before and after the
+#: solver is constructed, as (pre, post) pairs.
+MODIFIERS = {
+    None: (None, None),
+    'singleton': (_singleton, None),
+    'multitime': (_multitime, None),
+    'transpose': (_transpose, None),
+    'invlat': (_invert_latitude, _invert_latitude),
+}
+
+
+def _scale_for_radius(solution, radius):
+    factor = DEFAULT_RADIUS / radius
+    # Divergence and vorticity should be scaled by the inverse of the
+    # radius factor.
+    for field_name in ('vrt', 'div', 'vrt_trunc'):
+        solution[field_name] = solution[field_name] * factor
+    # Stream function and velocity potential should be scaled by the
+    # radius factor.
+    for field_name in ('psi', 'chi'):
+        solution[field_name] = solution[field_name] / factor
+
+
+def _metadata_cases(interface):
+    return [
+        Case(interface, 'regular', None, None, None),
+        Case(interface, 'gaussian', None, None, None),
+        Case(interface, 'regular', 'transpose', None, None),
+        Case(interface, 'regular', 'invlat', None, None),
+        Case(interface, 'regular', None, DEFAULT_RADIUS, None),
+        Case(interface, 'regular', None, DEFAULT_RADIUS / 16., None),
+        Case(interface, 'regular', None, None, 'computed'),
+    ]
+
+
+STANDARD_CASES = [
+    Case('standard', 'regular', None, None, None),
+    Case('standard', 'gaussian', None, None, None),
+    Case('standard', 'regular', 'singleton', None, None),
+    Case('standard', 'gaussian', 'singleton', None, None),
+    Case('standard', 'regular', 'multitime', None, None),
+    Case('standard', 'regular', None, DEFAULT_RADIUS, None),
+    Case('standard', 'regular', None, DEFAULT_RADIUS / 16., None),
+    Case('standard', 'regular', None, None, 'computed'),
+]
+
+METADATA_CASES = _metadata_cases('iris') + _metadata_cases('xarray')
+
+CASES = STANDARD_CASES + METADATA_CASES
+
+
+def _case_id(case):
+    parts = [case.interface, case.gridtype]
+    if case.modifier is not None:
+        parts.append(case.modifier)
+    if case.radius is not None:
+        parts.append('radius{:g}'.format(case.radius))
+    if case.legfunc is not None:
+        parts.append('legfunc-{!s}'.format(case.legfunc))
+    return '-'.join(parts)
+
+
+def _params(cases):
+    """
+    Wrap test cases as pytest parameters, marking those whose interface
+    is unavailable so they are skipped before any reference solution is
+    read or solver constructed.
+
+    """
+    msg = 'missing dependencies required to test the {!s} interface'
+    return [pytest.param(case, id=_case_id(case),
+                         marks=pytest.mark.skipif(
+                             case.interface not in solvers,
+                             reason=msg.format(case.interface)))
+            for case in cases]
+
+
+@functools.lru_cache(maxsize=None)
+def _solve(case):
+    """
+    Construct the solver and the matching reference solution for a
+    test case.
+
+    Results are cached so each configuration is only solved once per
+    test session, regardless of how many tests request it.
+
+    """
+    solution = reference_solutions(case.interface, case.gridtype)
+    pre_modify, post_modify = MODIFIERS[case.modifier]
+    if pre_modify is not None:
+        pre_modify(solution)
+    # gridtype argument only available for the standard interface
+    kwargs = {}
+    if case.interface == 'standard':
+        kwargs['gridtype'] = case.gridtype
+    if case.radius is not None:
+        kwargs['rsphere'] = case.radius
+    if case.legfunc is not None:
+        kwargs['legfunc'] = case.legfunc
+    vw = solvers[case.interface](solution['uwnd'], solution['vwnd'], **kwargs)
+    if post_modify is not None:
+        post_modify(solution)
+    if case.radius is not None and case.radius != DEFAULT_RADIUS:
+        _scale_for_radius(solution, case.radius)
+    return vw, solution
+
+
+@pytest.fixture(scope='session', params=_params(CASES))
+def solver(request):
+    """A solver and its reference solution, shared across the session."""
+    return _solve(request.param)
+
+
+class TestSolution(VectorWindTest):
+    """Solution tests for all interfaces and grid configurations."""
+
+    def test_magnitude(self, solver):
         # computed magnitude matches magnitude of reference solution?
-        mag1 = self.vw.magnitude()
-        mag2 = (self.solution['uwnd'] ** 2 + self.solution['vwnd'] ** 2) ** 0.5
+        vw, solution = solver
+        mag1 = vw.magnitude()
+        mag2 = (solution['uwnd'] ** 2 + solution['vwnd'] ** 2) ** 0.5
         self.assert_error_is_zero(mag1, mag2)
 
-    def test_vorticity(self):
+    def test_vorticity(self, solver):
         # computed vorticity matches reference solution?
-        vrt1 = self.vw.vorticity()
-        vrt2 = self.solution['vrt']
+        vw, solution = solver
+        vrt1 = vw.vorticity()
+        vrt2 = solution['vrt']
         self.assert_error_is_zero(vrt1, vrt2)
 
-    def test_divergence(self):
+    def test_divergence(self, solver):
         # computed divergence matches reference solution?
-        div1 = self.vw.divergence()
-        div2 = self.solution['div']
+        vw, solution = solver
+        div1 = vw.divergence()
+        div2 = solution['div']
         self.assert_error_is_zero(div1, div2)
 
-    def test_streamfunction(self):
+    def test_streamfunction(self, solver):
         # computed streamfunction matches reference solution?
-        sf1 = self.vw.streamfunction()
-        sf2 = self.solution['psi'].copy()
+        vw, solution = solver
+        sf1 = vw.streamfunction()
+        sf2 = solution['psi'].copy()
         self.assert_error_is_zero(sf1, sf2)
 
-    def test_velocitypotential(self):
+    def test_velocitypotential(self, solver):
         # computed velocity potential matches reference solution?
-        vp1 = self.vw.velocitypotential()
-        vp2 = self.solution['chi'].copy()
+        vw, solution = solver
+        vp1 = vw.velocitypotential()
+        vp2 = solution['chi'].copy()
         self.assert_error_is_zero(vp1, vp2)
 
-    def test_nondivergent(self):
+    def test_nondivergent(self, solver):
         # computed non-divergent vector wind matches reference solution?
-        upsi1, vpsi1 = self.vw.nondivergentcomponent()
-        upsi2, vpsi2 = self.solution['upsi'], self.solution['vpsi']
+        vw, solution = solver
+        upsi1, vpsi1 = vw.nondivergentcomponent()
+        upsi2, vpsi2 = solution['upsi'], solution['vpsi']
         self.assert_error_is_zero(upsi1, upsi2)
         self.assert_error_is_zero(vpsi1, vpsi2)
 
-    def test_irrotational(self):
+    def test_irrotational(self, solver):
         # computed irrotational vector wind matches reference solution?
-        uchi1, vchi1 = self.vw.irrotationalcomponent()
-        uchi2, vchi2 = self.solution['uchi'], self.solution['vchi']
+        vw, solution = solver
+        uchi1, vchi1 = vw.irrotationalcomponent()
+        uchi2, vchi2 = solution['uchi'], solution['vchi']
         self.assert_error_is_zero(uchi1, uchi2)
         self.assert_error_is_zero(vchi1, vchi2)
 
-    def test_gradient(self):
+    def test_gradient(self, solver):
         # computed gradient matches reference solution?
-        uchi1, vchi1 = self.vw.gradient(self.solution['chi'])
-        uchi2, vchi2 = self.solution['chigradu'], self.solution['chigradv']
+        vw, solution = solver
+        uchi1, vchi1 = vw.gradient(solution['chi'])
+        uchi2, vchi2 = solution['chigradu'], solution['chigradv']
         self.assert_error_is_zero(uchi1, uchi2)
         self.assert_error_is_zero(vchi1, vchi2)
 
-    def test_vrtdiv(self):
+    def test_vrtdiv(self, solver):
         # vrtdiv() matches vorticity()/divergence()?
-        vrt1, div1 = self.vw.vrtdiv()
-        vrt2 = self.vw.vorticity()
-        div2 = self.vw.divergence()
+        vw, solution = solver
+        vrt1, div1 = vw.vrtdiv()
+        vrt2 = vw.vorticity()
+        div2 = vw.divergence()
         self.assert_error_is_zero(vrt1, vrt2)
         self.assert_error_is_zero(div1, div2)
 
-    def test_sfvp(self):
+    def test_sfvp(self, solver):
         # sfvp() matches streamfunction()/velocitypotential()?
-        sf1, vp1 = self.vw.sfvp()
-        sf2 = self.vw.streamfunction()
-        vp2 = self.vw.velocitypotential()
+        vw, solution = solver
+        sf1, vp1 = vw.sfvp()
+        sf2 = vw.streamfunction()
+        vp2 = vw.velocitypotential()
         self.assert_error_is_zero(sf1, sf2)
         self.assert_error_is_zero(vp1, vp2)
 
-    def test_helmholtz(self):
+    def test_helmholtz(self, solver):
         # helmholtz() matches irrotationalcomponent()/nondivergentcomponent()?
-        uchi1, vchi1, upsi1, vpsi1 = self.vw.helmholtz()
-        uchi2, vchi2 = self.vw.irrotationalcomponent()
-        upsi2, vpsi2 = self.vw.nondivergentcomponent()
-        uchi, vchi, upsi2, vpsi2 = self.vw.helmholtz()
+        vw, solution = solver
+        uchi1, vchi1, upsi1, vpsi1 = vw.helmholtz()
+        uchi2, vchi2 = vw.irrotationalcomponent()
+        upsi2, vpsi2 = vw.nondivergentcomponent()
         self.assert_error_is_zero(uchi1, uchi2)
         self.assert_error_is_zero(vchi1, vchi2)
         self.assert_error_is_zero(upsi1, upsi2)
         self.assert_error_is_zero(vpsi1, vpsi2)
 
-    def test_truncate(self):
+    def test_truncate(self, solver):
         # vorticity truncated to T21 matches reference?
-        vrt_trunc = self.vw.truncate(self.solution['vrt'], truncation=21)
-        self.assert_error_is_zero(vrt_trunc, self.solution['vrt_trunc'])
-
-
-# ----------------------------------------------------------------------------
-# Tests for the standard interface
-
-
-class StandardSolutionTest(SolutionTest):
-    """Base class for all standard interface solution test classes."""
-    interface = 'standard'
-
-
-class TestStandardRegular(StandardSolutionTest):
-    """Regular grid."""
-    gridtype = 'regular'
-
-
-class TestStandardGaussian(StandardSolutionTest):
-    """Gaussian grid."""
-    gridtype = 'gaussian'
-
-
-class TestStandardRegularSingleton(StandardSolutionTest):
-    """Singleton right-most dimension."""
-    gridtype = 'regular'
-
-    @classmethod
-    def pre_modify_solution(cls):
-        for field_name in cls.solution:
-            cls.solution[field_name] = \
-                cls.solution[field_name][..., np.newaxis]
-
-
-class TestStandardGaussianSingleton(StandardSolutionTest):
-    """Singleton right-most dimension."""
-    gridtype = 'gaussian'
-
-    @classmethod
-    def pre_modify_solution(cls):
-        for field_name in cls.solution:
-            cls.solution[field_name] = \
-                cls.solution[field_name][..., np.newaxis]
-
-
-class TestStandardMultiTime(StandardSolutionTest):
-    gridtype = 'regular'
-
-    @classmethod
-    def pre_modify_solution(cls):
-        for field_name in cls.solution:
-            cls.solution[field_name] = \
-                cls.solution[field_name][..., np.newaxis].repeat(5, axis=-1)
-
-
-class TestStandardRadiusDefaultExplicit(StandardSolutionTest):
-    gridtype = 'regular'
-    radius = 6.3712e6
-
-
-class TestStandardRadius(StandardSolutionTest):
-    gridtype = 'regular'
-    radius = 6.3712e6 / 16.
-
-    @classmethod
-    def post_modify_solution(cls):
-        # Divergence and vorticity should be scaled by the inverse of the
-        # radius factor.
-        cls.solution['vrt'] = cls.solution['vrt'] * 16.
-        cls.solution['div'] = cls.solution['div'] * 16.
-        cls.solution['vrt_trunc'] = cls.solution['vrt_trunc'] * 16
-        # Stream function and velocity potential should be scaled by the
-        # radius factor.
-        cls.solution['psi'] = cls.solution['psi'] / 16
-        cls.solution['chi'] = cls.solution['chi'] / 16
-
-
-class TestStandardLegfuncComputed(StandardSolutionTest):
-    """Computed Legendre functions."""
-    gridtype = 'regular'
-    legfunc = 'computed'
-
-
-# ----------------------------------------------------------------------------
-# Tests for the Iris interface
-
-
-class IrisSolutionTest(SolutionTest):
-    """Base class for all Iris interface solution test classes."""
-    interface = 'iris'
-
-    def test_truncate_reversed(self):
-        vrt_trunc = self.vw.truncate(self.solution['vrt'][::-1], truncation=21)
-        self.assert_error_is_zero(vrt_trunc, self.solution['vrt_trunc'])
-
-
-class TestIrisRegular(IrisSolutionTest):
-    """Regular grid."""
-    gridtype = 'regular'
-
-
-class TestIrisGaussian(IrisSolutionTest):
-    """Gaussian grid."""
-    gridtype = 'gaussian'
-
-
-class TestIrisGridTranspose(IrisSolutionTest):
-    gridtype = 'regular'
-
-    @classmethod
-    def pre_modify_solution(cls):
-        for field_name in cls.solution.keys():
-            cls.solution[field_name].transpose([1, 0])
-
-    def test_truncate_reversed(self):
-        vrt_trunc = self.vw.truncate(self.solution['vrt'][:, ::-1],
-                                     truncation=21)
-        self.assert_error_is_zero(vrt_trunc, self.solution['vrt_trunc'])
-
-
-class TestIrisInvertedLatitude(IrisSolutionTest):
-    gridtype = 'regular'
-
-    @classmethod
-    def pre_modify_solution(cls):
-        for field_name in ('uwnd', 'vwnd'):
-            cls.solution[field_name] = cls.solution[field_name][::-1]
-
-    @classmethod
-    def post_modify_solution(cls):
-        for field_name in ('uwnd', 'vwnd'):
-            cls.solution[field_name] = cls.solution[field_name][::-1]
-
-
-class TestIrisRadiusDefaultExplicit(IrisSolutionTest):
-    gridtype = 'regular'
-    radius = 6.3712e6
-
-
-class TestIrisRadius(IrisSolutionTest):
-    gridtype = 'regular'
-    radius = 6.3712e6 / 16.
-
-    @classmethod
-    def post_modify_solution(cls):
-        # Divergence and vorticity should be scaled by the inverse of the
-        # radius factor.
-        cls.solution['vrt'] = cls.solution['vrt'] * 16.
-        cls.solution['div'] = cls.solution['div'] * 16.
-        cls.solution['vrt_trunc'] = cls.solution['vrt_trunc'] * 16
-        # Stream function and velocity potential should be scaled by the
-        # radius factor.
-        cls.solution['psi'] = cls.solution['psi'] / 16
-        cls.solution['chi'] = cls.solution['chi'] / 16
-
-
-class TestIrisLegfuncComputed(IrisSolutionTest):
-    """Computed Legendre functions."""
-    gridtype = 'regular'
-    legfunc = 'computed'
-
-
-# ----------------------------------------------------------------------------
-# Tests for the Xarray interface
-
-
-class XarraySolutionTest(SolutionTest):
-    """Base class for all Xarray interface solution test classes."""
-    interface = 'xarray'
-
-    def test_truncate_reversed(self):
-        vrt_trunc = self.vw.truncate(self.solution['vrt'][::-1], truncation=21)
-        self.assert_error_is_zero(vrt_trunc, self.solution['vrt_trunc'])
-
-
-class TestXarrayRegular(XarraySolutionTest):
-    """Regular grid."""
-    gridtype = 'regular'
-
-
-class TestXarrayGaussian(XarraySolutionTest):
-    """Gaussian grid."""
-    gridtype = 'gaussian'
-
-
-class TestXarrayGridTranspose(XarraySolutionTest):
-    gridtype = 'regular'
-
-    @classmethod
-    def pre_modify_solution(cls):
-        for field_name in cls.solution.keys():
-            cls.solution[field_name] = cls.solution[field_name].transpose()
-
-    def test_truncate_reversed(self):
-        vrt_trunc = self.vw.truncate(self.solution['vrt'][:, ::-1],
-                                     truncation=21)
-        self.assert_error_is_zero(vrt_trunc, self.solution['vrt_trunc'])
-
-
-class TestXarrayInvertedLatitude(XarraySolutionTest):
-    gridtype = 'regular'
-
-    @classmethod
-    def pre_modify_solution(cls):
-        for field_name in ('uwnd', 'vwnd'):
-            cls.solution[field_name] = cls.solution[field_name][::-1]
-
-    @classmethod
-    def post_modify_solution(cls):
-        for field_name in ('uwnd', 'vwnd'):
-            cls.solution[field_name] = cls.solution[field_name][::-1]
-
-
-class TestXarrayRadiusDefaultExplicit(XarraySolutionTest):
-    gridtype = 'regular'
-    radius = 6.3712e6
-
-
-class TestXarrayRadius(XarraySolutionTest):
-    gridtype = 'regular'
-    radius = 6.3712e6 / 16.
-
-    @classmethod
-    def post_modify_solution(cls):
-        # Divergence and vorticity should be scaled by the inverse of the
-        # radius factor.
-        cls.solution['vrt'] = cls.solution['vrt'] * 16.
-        cls.solution['div'] = cls.solution['div'] * 16.
-        cls.solution['vrt_trunc'] = cls.solution['vrt_trunc'] * 16
-        # Stream function and velocity potential should be scaled by the
-        # radius factor.
-        cls.solution['psi'] = cls.solution['psi'] / 16
-        cls.solution['chi'] = cls.solution['chi'] / 16
-
-
-class TestXarrayLegfuncComputed(XarraySolutionTest):
-    """Computed Legendre functions."""
-    gridtype = 'regular'
-    legfunc = 'computed'
+        vw, solution = solver
+        vrt_trunc = vw.truncate(solution['vrt'], truncation=21)
+        self.assert_error_is_zero(vrt_trunc, solution['vrt_trunc'])
+
+    @pytest.mark.parametrize('case', _params(METADATA_CASES))
+    def test_truncate_reversed(self, case):
+        # truncating a field with a reversed latitude dimension matches
+        # reference?
+        vw, solution = _solve(case)
+        if case.modifier == 'transpose':
+            reverse_latitude = (slice(None), slice(None, None, -1))
+        else:
+            reverse_latitude = slice(None, None, -1)
+        vrt_trunc = vw.truncate(solution['vrt'][reverse_latitude],
+                                truncation=21)
+        self.assert_error_is_zero(vrt_trunc, solution['vrt_trunc'])
+
+    @pytest.mark.parametrize('case', _params(
+        [case for case in CASES
+         if case.modifier is None and case.radius is None and
+         case.legfunc is None]))
+    def test_same_components(self, case):
+        # passing one array as both components matches passing two
+        # separate arrays?
+        solution = reference_solutions(case.interface, case.gridtype)
+        kwargs = {}
+        if case.interface == 'standard':
+            kwargs['gridtype'] = case.gridtype
+        u = solution['uwnd']
+        vw1 = solvers[case.interface](u, u, **kwargs)
+        vw2 = solvers[case.interface](u, u.copy(), **kwargs)
+        self.assert_error_is_zero(vw1.vorticity(), vw2.vorticity())
+        self.assert_error_is_zero(vw1.divergence(), vw2.divergence())
+
+    def test_diagnostics(self, solver):
+        # computed diagnostics match reference solutions?
+        vw, solution = solver
+        diags = vw.diagnostics()
+        references = {'vrt': 'vrt', 'div': 'div', 'sf': 'psi', 'vp': 'chi',
+                      'uchi': 'uchi', 'vchi': 'vchi', 'upsi': 'upsi',
+                      'vpsi': 'vpsi'}
+        assert sorted(diags) == sorted(references)
+        for name, reference in references.items():
+            self.assert_error_is_zero(diags[name], solution[reference])
+
+    def test_diagnostics_subset(self, solver):
+        # only the requested diagnostics are returned, in order?
+        vw, solution = solver
+        diags = vw.diagnostics(which=('vpsi', 'sf'))
+        assert list(diags) == ['vpsi', 'sf']
+        self.assert_error_is_zero(diags['vpsi'], solution['vpsi'])
+        self.assert_error_is_zero(diags['sf'], solution['psi'])
+
+    def test_diagnostics_single(self, solver):
+        # a single diagnostic can be requested by name?
+        vw, solution = solver
+        diags = vw.diagnostics(which='vrt')
+        assert list(diags) == ['vrt']
+        self.assert_error_is_zero(diags['vrt'], solution['vrt'])
+
+    def test_diagnostics_truncation(self, solver):
+        # truncated diagnostics match reference?
+        vw, solution = solver
+        diags = vw.diagnostics(truncation=21, which=('vrt',))
+        self.assert_error_is_zero(diags['vrt'], solution['vrt_trunc'])
+
+
+class TestStandardSolution(VectorWindTest):
+    """Solution tests specific to the standard interface."""
+
+    def test_magnitude_integer(self):
+        # integer winds give a floating-point magnitude, without
+        # overflowing when the components are squared?
+        vw = solvers['standard'](np.full((73, 144), 60000, dtype=np.int32),
+                                 np.full((73, 144), 80000, dtype=np.int32))
+        speed = vw.magnitude()
+        assert speed.dtype == np.float64
+        assert (speed == 100000).all()
+
+    def test_spharmt_shared(self):
+        # solvers on the same grid share one Spharmt instance?
+        solution = reference_solutions('standard', 'regular')
+        vw1 = solvers['standard'](solution['uwnd'], solution['vwnd'])
+        vw2 = solvers['standard'](solution['vwnd'], solution['uwnd'])
+        assert vw1.s is vw2.s
+
+    def test_spharmt_array_radius(self):
+        # a 0-d array radius is accepted and shares the Spharmt instance?
+        solution = reference_solutions('standard', 'regular')
+        vw1 = solvers['standard'](solution['uwnd'], solution['vwnd'],
+                                  rsphere=np.array(DEFAULT_RADIUS))
+        vw2 = solvers['standard'](solution['uwnd'], solution['vwnd'],
+                                  rsphere=DEFAULT_RADIUS)
+        assert vw1.s is vw2.s
+
+    def test_cached_results_independent(self):
+        # modifying returned grids does not change later results computed
+        # from the cached spectral coefficients?
+        solution = reference_solutions('standard', 'regular')
+        vw = solvers['standard'](solution['uwnd'], solution['vwnd'])
+        vrt, div = vw.vrtdiv()
+        vrt[:] = 0
+        div[:] = 0
+        self.assert_error_is_zero(vw.vorticity(), solution['vrt'])
+        self.assert_error_is_zero(vw.divergence(), solution['div'])
+        sf = vw.streamfunction()
+        sf[:] = 0
+        self.assert_error_is_zero(vw.sfvp()[0], solution['psi'])
+
+    def test_vorticity_precision(self):
+        # planetary and absolute vorticity follow the precision of the
+        # input winds?
+        solution = reference_solutions('standard', 'regular')
+        vw = solvers['standard'](solution['uwnd'], solution['vwnd'])
+        assert vw.vorticity().dtype == np.float32
+        assert vw.planetaryvorticity().dtype == np.float32
+        assert vw.absolutevorticity().dtype == np.float32
+        vw = solvers['standard'](solution['uwnd'].astype(np.float64),
+                                 solution['vwnd'].astype(np.float64))
+        assert vw.planetaryvorticity().dtype == np.float64
+        assert vw.absolutevorticity().dtype == np.float64
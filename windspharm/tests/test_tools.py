@@ -22,36 +22,100 @@ from __future__ import absolute_import
 
 import numpy as np
 from numpy.testing import assert_array_equal
+import pytest
 
-from windspharm.tools import (prep_data, recover_data, get_recovery,
-                              reverse_latdim, order_latdim)
+from windspharm.tools import (prep_data, prep_data_batch, recover_data,
+                              get_recovery, reverse_latdim, order_latdim)
 from windspharm.tests import VectorWindTest
 
 
 class TestTools(VectorWindTest):
     """Tests for extra tools."""
 
+    @classmethod
+    def setup_class(cls):
+        # The tests only check that data is rearranged correctly, so the
+        # same small arrays are shared by all of them. They must not be
+        # modified. Every element is distinct so any misplaced value is
+        # detected, and the latitude dimension matches a 2.5 degree grid.
+        cls.u = np.arange(3 * 4 * 73 * 8, dtype=np.float32).reshape(
+            3, 4, 73, 8)
+        cls.v = cls.u + cls.u.size
+        cls.u.flags.writeable = False
+        cls.v.flags.writeable = False
+
     def test_prep_recover_data(self):
         # applying preparation and recovery should yield an identical data set
-        u = np.random.rand(12, 17, 73, 144)
+        u = self.u
+        up, uinfo = prep_data(u, 'tzyx')
+        ur = recover_data(up, uinfo)
+        assert_array_equal(u, ur)
+
+    def test_recover_data_copy(self):
+        # recovery should return a view by default and a copy on request
+        u = self.u
         up, uinfo = prep_data(u, 'tzyx')
+        ur1 = recover_data(up, uinfo)
+        ur2 = recover_data(up, uinfo, copy=True)
+        assert np.shares_memory(ur1, up)
+        assert not np.shares_memory(ur2, up)
+        assert ur2.flags['C_CONTIGUOUS']
+        assert_array_equal(ur1, ur2)
+
+    def test_prep_recover_data_windspharm_order(self):
+        # data already in windspharm order should round-trip unchanged
+        u = np.ascontiguousarray(self.u.transpose(2, 3, 0, 1))
+        up, uinfo = prep_data(u, 'yxtz')
+        assert up.shape == (73, 8, 3 * 4)
+        assert not uinfo['copied_on_prep']
         ur = recover_data(up, uinfo)
         assert_array_equal(u, ur)
 
     def test_get_recovery(self):
         # recovery helper should produce the same result as the manual method
-        u = np.random.rand(12, 17, 73, 144)
+        u = self.u
         up, uinfo = prep_data(u, 'tzyx')
         ur1 = recover_data(up, uinfo)
         recover = get_recovery(uinfo)
         ur2, = recover(up)
         assert_array_equal(ur1, ur2)
 
+    def test_prep_data_out(self):
+        # preparing into a supplied array should match the default and
+        # reuse the supplied array
+        u = self.u
+        up1, uinfo = prep_data(u, 'tzyx')
+        out = np.empty(up1.shape)
+        up2, _ = prep_data(u, 'tzyx', out=out)
+        assert up2 is out
+        assert_array_equal(up1, up2)
+
+    def test_prep_data_out_masked(self):
+        # preparing masked data into a supplied array would lose the mask
+        u = np.ma.masked_less(self.u, 10)
+        up, _ = prep_data(u, 'tzyx')
+        with pytest.raises(ValueError):
+            prep_data(u, 'tzyx', out=np.empty(up.shape))
+
+    def test_prep_data_batch(self):
+        # batch preparation should match preparing each array separately
+        u = self.u
+        v = self.v
+        (up, vp), info = prep_data_batch(u, v, dimorder='tzyx')
+        up1, uinfo = prep_data(u, 'tzyx')
+        vp1, _ = prep_data(v, 'tzyx')
+        assert_array_equal(up, up1)
+        assert_array_equal(vp, vp1)
+        assert info == uinfo
+        ur, vr = get_recovery(info)(up, vp)
+        assert_array_equal(u, ur)
+        assert_array_equal(v, vr)
+
     def test_reverse_latdim(self):
         # applying reversal to the latitude dimension twice should return it to
         # its original
-        u = np.random.rand(12, 17, 73, 144)
-        v = np.random.rand(12, 17, 73, 144)
+        u = self.u
+        v = self.v
         ur, vr = reverse_latdim(u, v, axis=2)
         urr, vrr = reverse_latdim(ur, vr, axis=2)
         assert_array_equal(u, urr)
@@ -59,8 +123,8 @@ class TestTools(VectorWindTest):
 
     def test_order_latdim(self):
         # order_latdim should reverse a south-north latitude dimension
-        u = np.random.rand(12, 17, 73, 144)
-        v = np.random.rand(12, 17, 73, 144)
+        u = self.u
+        v = self.v
         lat = np.arange(-90, 92.5, 2.5)
         latr, ur, vr = order_latdim(lat, u, v, axis=2)
         assert_array_equal(lat[::-1], latr)
@@ -69,10 +133,21 @@ class TestTools(VectorWindTest):
 
     def test_order_latdim_null(self):
         # order_latdim should not reverse a north-south latitude dimension
-        u = np.random.rand(12, 17, 73, 144)
-        v = np.random.rand(12, 17, 73, 144)
+        u = self.u
+        v = self.v
         lat = np.arange(90, -92.5, -2.5)
         latr, ur, vr = order_latdim(lat, u, v, axis=2)
         assert_array_equal(lat, latr)
         assert_array_equal(u, ur)
         assert_array_equal(v, vr)
+
+    def test_order_latdim_nocopy(self):
+        # order_latdim should return the inputs themselves when no reversal
+        # is needed and copying is disabled
+        u = self.u
+        v = self.v
+        lat = np.arange(90, -92.5, -2.5)
+        latr, ur, vr = order_latdim(lat, u, v, axis=2, copy=False)
+        assert latr is lat
+        assert ur is u
+        assert vr is v
@@ -23,15 +23,14 @@ from __future__ import absolute_import
 import numpy as np
 try:
     from iris.cube import Cube
+    _HAS_IRIS = True
 except ImportError:
-    pass
+    _HAS_IRIS = False
 try:
     import xarray as xr
+    _HAS_XARRAY = True
 except ImportError:
-    try:
-        import xray as xr
-    except ImportError:
-        pass
+    _HAS_XARRAY = False
 
 
 def __tomasked(*args):
@@ -41,17 +40,14 @@ def __tomasked(*args):
 
     """
     def __asma(a):
-        try:
-            if isinstance(a, Cube):
-                # Retrieve the data from the cube.
-                a = a.data
-        except NameError:
-            pass
-        try:
-            if isinstance(a, xr.DataArray):
-                a = a.values
-        except NameError:
-            pass
+        if isinstance(a, np.ndarray):
+            # Plain and masked arrays are the most common inputs.
+            return a
+        if _HAS_IRIS and isinstance(a, Cube):
+            # Retrieve the data from the cube.
+            a = a.data
+        elif _HAS_XARRAY and isinstance(a, xr.DataArray):
+            a = a.values
         return a
     return [__asma(a) for a in args]
 
@@ -63,8 +59,11 @@ def error(a, b):
 
     """
     a, b = __tomasked(a, b)
-
-    return np.sqrt(((a - b)**2).mean()) / (np.max(b) - np.min(b))
+    # Square the difference in place so only one full-size temporary is
+    # created.
+    sqdiff = a - b
+    sqdiff *= sqdiff
+    return np.sqrt(sqdiff.mean()) / np.ptp(b)
 
 
 if __name__ == '__main__':
@@ -24,30 +24,56 @@ Tools for managing data for use with `~windspharm.standard.VectorWind`
 # THE SOFTWARE.
 from __future__ import absolute_import
 
+import functools
+from math import prod
+
 import numpy as np
 
 
-def __order_dims(d, inorder):
+@functools.lru_cache(maxsize=64)
+def __plan(inorder):
+    # Work out how to move latitude and longitude to the front of an
+    # array with the given dimension order, and how to undo it. The plan
+    # only depends on the order, so it is cached for repeated calls.
     if 'x' not in inorder or 'y' not in inorder:
         raise ValueError('a latitude-longitude grid is required')
     lonpos = inorder.lower().find('x')
     latpos = inorder.lower().find('y')
-    d = np.rollaxis(d, lonpos)
-    if latpos < lonpos:
-        latpos += 1
-    d = np.rollaxis(d, latpos)
-    outorder = inorder.replace('x', '')
-    outorder = outorder.replace('y', '')
-    outorder = 'yx' + outorder
-    return d, outorder
+    # Move latitude and longitude to the front in a single transpose,
+    # leaving the other dimensions in their original order.
+    axes = (latpos, lonpos) + tuple(i for i in range(len(inorder))
+                                    if i not in (latpos, lonpos))
+    outorder = ''.join(inorder[i] for i in axes)
+    if outorder == inorder:
+        # Already in windspharm order, no transpose is required either way.
+        return None, outorder, None
+    # The recovery permutation is the inverse of the transpose.
+    recovery_axes = [0] * len(axes)
+    for new_position, old_position in enumerate(axes):
+        recovery_axes[old_position] = new_position
+    return axes, outorder, tuple(recovery_axes)
+
+
+def __transpose(d, axes):
+    # Transpose an array, where axes of None means no transpose at all.
+    if axes is None:
+        return d
+    return d.transpose(axes)
 
 
 def __reshape(d):
-    out = d.reshape(d.shape[:2] + (np.prod(d.shape[2:], dtype=int),))
-    return out, d.shape
-
-
-def prep_data(data, dimorder):
+    # Reshaping a non-contiguous array silently copies it, so make any
+    # copy explicit up front. C-contiguous arrays are reshaped as a view,
+    # anything else is copied once. np.require is used rather than
+    # np.ascontiguousarray because it preserves masked arrays.
+    copied = not d.flags['C_CONTIGUOUS']
+    if copied:
+        d = np.require(d, requirements='C')
+    out = d.reshape(d.shape[:2] + (prod(d.shape[2:]),))
+    return out, d.shape, copied
+
+
+def prep_data(data, dimorder, out=None):
     """
     Prepare data for input to `~windspharm.standard.VectorWind` (or to
     `spharm.Spharmt` method calls).
@@ -67,17 +93,33 @@ def prep_data(data, dimorder):
         respectively. Any other characters can be used to represent
         other dimensions.
 
+    **Optional argument:**
+
+    *out*
+        A C-contiguous array with the shape of the prepared data, i.e.
+        (latitude, longitude, other), to write the prepared data into.
+        Supplying the same array on repeated calls avoids allocating a
+        new array each time. Defaults to `None`, meaning a view of
+        *data* is returned where possible and a new array otherwise.
+        *out* cannot be used with masked arrays since the mask would be
+        lost, a `ValueError` is raised if *data* is a
+        `numpy.ma.MaskedArray`.
+
     **Returns:**
 
     *pdata*
-        *data* reshaped/reordered to (latitude, longitude, other).
+        *data* reshaped/reordered to (latitude, longitude, other). This
+        is *out* if it was supplied.
 
     *info*
-        A dictionary of information required to recover *data*.
+        A dictionary of information required to recover *data*. The
+        ``'copied_on_prep'`` entry records whether *data* had to be
+        copied to put it in the required order; if it is `False` then
+        *pdata* is a view of *data*.
 
     **See also:**
 
-    `recover_data`, `get_recovery`.
+    `recover_data`, `get_recovery`, `prep_data_batch`.
 
     **Examples:**
 
@@ -92,17 +134,128 @@ def prep_data(data, dimorder):
 
         pdata, info = prep_data(data, 'xayb')
 
+    Prepare a sequence of arrays with dimensions (12, 17, 73, 144)
+    where the dimensions are (time, level, latitude, longitude), reusing
+    one output array for all of them::
+
+        out = np.empty((73, 144, 12 * 17))
+        for data in datasets:
+            pdata, info = prep_data(data, 'tzyx', out=out)
+            ...
+
     """
     # Returns the prepared data and some data info to help data recovery.
-    pdata, intorder = __order_dims(data, dimorder)
-    pdata, intshape = __reshape(pdata)
+    if data.ndim != len(dimorder):
+        raise ValueError('dimorder must have one character per dimension')
+    axes, intorder, recovery_axes = __plan(dimorder)
+    if out is None:
+        pdata, intshape, copied = __reshape(__transpose(data, axes))
+    else:
+        data = __transpose(data, axes)
+        intshape = data.shape
+        if out.shape != intshape[:2] + (prod(intshape[2:]),):
+            raise ValueError('out has the wrong shape for the prepared data')
+        if not out.flags['C_CONTIGUOUS']:
+            raise ValueError('out must be C-contiguous')
+        if np.ma.isMaskedArray(data):
+            raise ValueError('out cannot be used with masked data')
+        # Copy straight into the output buffer in a single pass.
+        np.copyto(out.reshape(intshape), data)
+        pdata, copied = out, True
     info = dict(intermediate_shape=intshape,
                 intermediate_order=intorder,
-                original_order=dimorder)
+                original_order=dimorder,
+                recovery_axes=recovery_axes,
+                copied_on_prep=copied)
     return pdata, info
 
 
-def recover_data(pdata, info):
+def prep_data_batch(*fields, dimorder):
+    """
+    Prepare several data arrays with the same shape and dimension order
+    for input to `~windspharm.standard.VectorWind` (or to
+    `spharm.Spharmt` method calls).
+
+    This is equivalent to calling `prep_data` on each array, but the
+    preparation is planned once and a single dictionary of recovery
+    information is returned for all of the arrays.
+
+    **Arguments:**
+
+    *fields*
+        Data arrays, which must all have the same shape. Each array must
+        be at least 2D.
+
+    **Keyword argument:**
+
+    *dimorder*
+        String specifying the order of dimensions in the data arrays, as
+        for `prep_data`. This argument must be given by keyword.
+
+    **Returns:**
+
+    *pfields*
+        A `list` containing each of *fields* reshaped/reordered to
+        (latitude, longitude, other).
+
+    *info*
+        A dictionary of information required to recover the arrays. The
+        ``'copied_on_prep'`` entry is `True` if any of the arrays had to
+        be copied.
+
+    **See also:**
+
+    `prep_data`, `get_recovery`.
+
+    **Example:**
+
+    Prepare zonal and meridional wind components with dimensions
+    (time, level, latitude, longitude) and recover the outputs of a
+    `~windspharm.standard.VectorWind` method call::
+
+        (u, v), info = prep_data_batch(u, v, dimorder='tzyx')
+        w = VectorWind(u, v)
+        sf, vp = w.sfvp()
+        recover = get_recovery(info)
+        sf, vp = recover(sf, vp)
+
+    """
+    if not fields:
+        raise ValueError('at least one data array is required')
+    shape = fields[0].shape
+    if any(field.shape != shape for field in fields[1:]):
+        raise ValueError('all data arrays must have the same shape')
+    if len(shape) != len(dimorder):
+        raise ValueError('dimorder must have one character per dimension')
+    axes, intorder, recovery_axes = __plan(dimorder)
+    pfields = []
+    copied_any = False
+    for field in fields:
+        pfield, intshape, copied = __reshape(__transpose(field, axes))
+        pfields.append(pfield)
+        copied_any = copied_any or copied
+    info = dict(intermediate_shape=intshape,
+                intermediate_order=intorder,
+                original_order=dimorder,
+                recovery_axes=recovery_axes,
+                copied_on_prep=copied_any)
+    return pfields, info
+
+
+def _recovery_axes(info):
+    # The permutation that takes an array in the intermediate
+    # (windspharm) dimension order back to the original order, or None if
+    # the two orders are the same.
+    # Information dictionaries created by older versions do not contain
+    # it, so compute it if necessary.
+    try:
+        return info['recovery_axes']
+    except KeyError:
+        return tuple(info['intermediate_order'].index(dim)
+                     for dim in info['original_order'])
+
+
+def recover_data(pdata, info, copy=False):
     """
     Recover the shape and dimension order of an array output from
     `~windspharm.standard.VectorWind` methods (or from `spharm.Spharmt`
@@ -121,6 +274,13 @@ def recover_data(pdata, info):
     *info*
         Information dictionary output from `prep_data`.
 
+    **Optional argument:**
+
+    *copy*
+        If `False` (default) the output is a view of *pdata* whenever
+        *pdata* is contiguous, so modifying it will also modify *pdata*.
+        If `True` the output is a new C-contiguous array.
+
     **Returns:**
 
     *data*
@@ -140,15 +300,12 @@ def recover_data(pdata, info):
         data = recover_data(pdata, info)
 
     """
-    # Convert to intermediate shape (full dimensionality, windspharm order).
-    data = pdata.reshape(info['intermediate_shape'])
-    # Re-order dimensions correctly.
-    rolldims = np.array([info['intermediate_order'].index(dim)
-                         for dim in info['original_order'][::-1]])
-    for i in range(len(rolldims)):
-        # Roll the axis to the front.
-        data = np.rollaxis(data, rolldims[i])
-        rolldims = np.where(rolldims < rolldims[i], rolldims + 1, rolldims)
+    # Convert to intermediate shape (full dimensionality, windspharm order)
+    # then re-order the dimensions correctly.
+    data = __transpose(pdata.reshape(info['intermediate_shape']),
+                       _recovery_axes(info))
+    if copy:
+        data = data.copy()
     return data
 
 
@@ -163,7 +320,7 @@ Returns a `list` of variables.
 """
 
 
-def get_recovery(info):
+def get_recovery(info, copy=False):
     """
     Return a function that can be used to recover the shape and
     dimension order of multiple arrays output from
@@ -175,6 +332,13 @@ def get_recovery(info):
     *info*
         Information dictionary output from `prep_data`.
 
+    **Optional argument:**
+
+    *copy*
+        If `False` (default) the recovered arrays are views of the
+        inputs where possible. If `True` they are new C-contiguous
+        arrays. See `recover_data`.
+
     **Returns:**
 
     *recover*
@@ -198,8 +362,16 @@ def get_recovery(info):
         u, v, sf, vp = recover(u, v, sf, vp)
 
     """
+    # Look up the recovery shape and permutation once, rather than for
+    # every array recovered.
+    shape = info['intermediate_shape']
+    axes = _recovery_axes(info)
+
     def __recover(*args):
-        return [recover_data(arg, info) for arg in args]
+        recovered = [__transpose(arg.reshape(shape), axes) for arg in args]
+        if copy:
+            recovered = [arr.copy() for arr in recovered]
+        return recovered
     info_nice = ["'{!s}': {!s}".format(key, value)
                  for key, value in info.items()]
     __recover.__name__ = 'recover'
@@ -208,7 +380,7 @@ def get_recovery(info):
     return __recover
 
 
-def reverse_latdim(u, v, axis=0):
+def reverse_latdim(u, v, axis=0, copy=True):
     """
     Reverse the order of the latitude dimension of zonal and meridional
     wind components.
@@ -218,17 +390,23 @@ def reverse_latdim(u, v, axis=0):
     *u*, *v*
         Zonal and meridional wind components respectively.
 
-    **Optional argument:**
+    **Optional arguments:**
 
     *axis*
         Index of the latitude dimension. This dimension will be reversed
         in the input arrays. Defaults to 0 (the first dimension).
 
+    *copy*
+        If `True` (default) the outputs are copies of the input. If
+        `False` the outputs are reversed views of the input, which
+        avoids copying the data but means that modifying an output will
+        also modify the corresponding input.
+
     **Returns:**
 
     *ur*, *vr*
         Zonal and meridional wind components with the latitude dimensions
-        reversed. These are always copies of the input.
+        reversed.
 
     **See also:**
 
@@ -247,14 +425,19 @@ def reverse_latdim(u, v, axis=0):
         u, v = reverse_latdim(u, v, axis=2)
 
     """
-    slicelist = [slice(0, None)] * u.ndim
-    slicelist[axis] = slice(None, None, -1)
-    u = u.copy()[tuple(slicelist)]
-    v = v.copy()[tuple(slicelist)]
-    return u, v
-
-
-def order_latdim(latdim, u, v, axis=0):
+    # Build the index as a tuple once, the same index applies to both
+    # components.
+    index = [slice(None)] * u.ndim
+    index[axis] = slice(None, None, -1)
+    index = tuple(index)
+    if not copy:
+        return u[index], v[index]
+    # Copy the reversed view rather than reversing a copy, so the outputs
+    # are C-contiguous instead of negative-strided views of a copy.
+    return u[index].copy(), v[index].copy()
+
+
+def order_latdim(latdim, u, v, axis=0, copy=True):
     """Ensure the latitude dimension is north-to-south.
 
     Returns copies of the latitude dimension and wind components
@@ -262,6 +445,11 @@ def order_latdim(latdim, u, v, axis=0):
     latitude dimension is already in this order then the output will
     just be copies of the input.
 
+    Copying can be avoided by passing ``copy=False``, in which case the
+    outputs are the inputs themselves (if no reversal is needed) or
+    reversed views of them. The outputs then share memory with the
+    inputs, so modifying one modifies the other.
+
     **Arguments:**
 
     *latdim*
@@ -270,20 +458,25 @@ def order_latdim(latdim, u, v, axis=0):
     *u*, *v*
         Zonal and meridional wind components respectively.
 
-    **Keyword argument:**
+    **Keyword arguments:**
 
     *axis*
         Index of the latitude dimension in the zonal and meridional wind
         components. Defaults to 0 (the first dimension).
 
+    *copy*
+        If `True` (default) the outputs are always copies. If `False`
+        the outputs share memory with the inputs.
+
     **Returns:**
 
     *latdimr*
-        Possibly reversed *latdim*, always a copy of *latdim*.
+        Possibly reversed *latdim*, a copy of *latdim* unless *copy* is
+        `False`.
 
     *ur*, *vr*
-        Possibly reversed *u* and *v* respectively. Always copies of *u*
-        and *v* respectively.
+        Possibly reversed *u* and *v* respectively. Copies of *u* and
+        *v* respectively unless *copy* is `False`.
 
     **See also:**
 
@@ -302,12 +495,12 @@ def order_latdim(latdim, u, v, axis=0):
         latdim, u, v = order_latdim(latdim, u, v, axis=2)
 
     """
-    latdim = latdim.copy()
     if latdim[0] < latdim[-1]:
         latdim = latdim[::-1]
-        # reverse_latdim() will make copies of u and v
-        u, v = reverse_latdim(u, v, axis=axis)
-    else:
-        # we return copies from this function
+        # reverse_latdim() will make copies of u and v if required
+        u, v = reverse_latdim(u, v, axis=axis, copy=copy)
+    elif copy:
         u, v = u.copy(), v.copy()
+    if copy:
+        latdim = latdim.copy()
     return latdim, u, v
@@ -20,13 +20,66 @@
 # THE SOFTWARE.
 from __future__ import absolute_import
 
-try:
-    import xarray as xr
-except ImportError:
-    import xray as xr
+import numpy as np
+import xarray as xr
 
 from . import standard
-from ._common import get_apiorder, inspect_gridtype, to3d
+from ._common import (get_apiorder, get_diagnostics, inspect_gridtype,
+                      to3d)
+
+
+# CF metadata attached to the outputs of the VectorWind methods, keyed by
+# output variable name.
+_CF = {
+    'u': {
+        'units': 'm s**-1',
+        'standard_name': 'eastward_wind',
+        'long_name': 'eastward_component_of_wind'},
+    'v': {
+        'units': 'm s**-1',
+        'standard_name': 'northward_wind',
+        'long_name': 'northward_component_of_wind'},
+    'speed': {
+        'units': 'm s**-1',
+        'standard_name': 'wind_speed',
+        'long_name': 'wind_speed'},
+    'vorticity': {
+        'units': 's**-1',
+        'standard_name': 'atmosphere_relative_vorticity',
+        'long_name': 'relative_vorticity'},
+    'divergence': {
+        'units': 's**-1',
+        'standard_name': 'divergence_of_wind',
+        'long_name': 'horizontal_divergence'},
+    'coriolis': {
+        'units': 's**-1',
+        'standard_name': 'coriolis_parameter',
+        'long_name': 'planetary_vorticity'},
+    'absolute_vorticity': {
+        'units': 's**-1',
+        'standard_name': 'atmosphere_absolute_vorticity',
+        'long_name': 'absolute_vorticity'},
+    'streamfunction': {
+        'units': 'm**2 s**-1',
+        'standard_name': 'atmosphere_horizontal_streamfunction',
+        'long_name': 'streamfunction'},
+    'velocity_potential': {
+        'units': 'm**2 s**-1',
+        'standard_name': 'atmosphere_horizontal_velocity_potential',
+        'long_name': 'velocity potential'},
+    'u_chi': {
+        'units': 'm s**-1',
+        'long_name': 'irrotational_eastward_wind'},
+    'v_chi': {
+        'units': 'm s**-1',
+        'long_name': 'irrotational_northward_wind'},
+    'u_psi': {
+        'units': 'm s**-1',
+        'long_name': 'non_divergent_eastward_wind'},
+    'v_psi': {
+        'units': 'm s**-1',
+        'long_name': 'non_divergent_northward_wind'}
+}
 
 
 class VectorWind(object):
@@ -41,7 +94,9 @@ class VectorWind(object):
             Zonal and meridional components of the vector wind
             respectively. Both components should be `~xarray.DataArray`
             instances. The components must have the same dimension
-            coordinates and contain no missing values.
+            coordinates and contain no missing values. Components
+            backed by `dask` arrays are computed and loaded into memory
+            when the instance is created.
 
         **Optional argument:**
 
@@ -69,46 +124,66 @@ class VectorWind(object):
         """
         if not isinstance(u, xr.DataArray) or not isinstance(v, xr.DataArray):
             raise TypeError('u and v must be xarray.DataArray instances')
+        # If the same array is given for both components then it is only
+        # reordered once, and the standard interface only needs to copy and
+        # check it once.
+        same_components = v is u
         # Check that the dimension coordinates have the same names and values.
-        ucoords = [u.coords[name].values for name in u.dims]
-        vcoords = [v.coords[name].values for name in v.dims]
         if (u.dims != v.dims):
             msg = 'u and v must have the same dimension coordinates'
             raise ValueError(msg)
-        if not all([(uc == vc).all() for uc, vc in zip(ucoords, vcoords)]):
-            msg = 'u and v must have the same dimension coordinate values'
-            raise ValueError(msg)
+        for name in u.dims:
+            uc = u.coords[name].values
+            vc = v.coords[name].values
+            # Components taken from the same dataset usually share their
+            # coordinate arrays, which then need no element-wise comparison.
+            # Arrays with the same data pointer, shape, strides and dtype
+            # are views of the same values.
+            if uc.__array_interface__ == vc.__array_interface__:
+                continue
+            if not np.array_equal(uc, vc):
+                msg = 'u and v must have the same dimension coordinate values'
+                raise ValueError(msg)
         # Find the latitude and longitude coordinates and reverse the latitude
         # dimension if necessary.
         lat, lat_dim = _find_latitude_coordinate(u)
         lon, lon_dim = _find_longitude_coordinate(u)
-        if lat.values[0] < lat.values[1]:
+        latitudes = lat.values
+        if latitudes[0] < latitudes[-1]:
             u = _reverse(u, lat_dim)
-            v = _reverse(v, lat_dim)
-            lat, lat_dim = _find_latitude_coordinate(u)
+            v = u if same_components else _reverse(v, lat_dim)
+            latitudes = latitudes[::-1]
+        if (np.diff(latitudes) >= 0).any():
+            raise ValueError('latitudes must be monotonic')
         # Determine the gridtype of the input.
-        gridtype = inspect_gridtype(lat.values)
+        gridtype = inspect_gridtype(latitudes)
         # Determine how the DataArrays should be reordered to conform to the
         # windspharm.standard API.
-        apiorder, _ = get_apiorder(u.ndim, lat_dim, lon_dim)
+        apiorder, inv_perm = get_apiorder(u.ndim, lat_dim, lon_dim)
         apiorder = [u.dims[i] for i in apiorder]
         self._reorder = u.dims
-        u = u.copy().transpose(*apiorder)
-        v = v.copy().transpose(*apiorder)
+        u = u.transpose(*apiorder)
+        v = u if same_components else v.transpose(*apiorder)
         # Reshape the raw data and input into the API.
         self._ishape = u.shape
         self._coords = [u.coords[name] for name in u.dims]
+        # Build a template with the output coordinates in the input
+        # dimension order, outputs are created by copying it with new data.
+        # The template's data is a broadcast scalar so it uses no memory.
+        self._inv_perm = tuple(inv_perm)
+        self._template = xr.DataArray(
+            np.broadcast_to(np.zeros((), dtype=u.dtype), self._ishape),
+            coords=self._coords).transpose(*self._reorder)
         u = to3d(u.values)
-        v = to3d(v.values)
+        v = u if same_components else to3d(v.values)
         self._api = standard.VectorWind(u, v, gridtype=gridtype,
                                         rsphere=rsphere, legfunc=legfunc)
 
-    def _metadata(self, var, name, **attributes):
-        var = var.reshape(self._ishape)
-        var = xr.DataArray(var, coords=self._coords, name=name)
-        var = var.transpose(*self._reorder)
-        for attr, value in attributes.items():
-            var.attrs[attr] = value
+    def _metadata(self, var, name):
+        var = np.transpose(var.reshape(self._ishape), self._inv_perm)
+        var = self._template.copy(deep=False, data=var)
+        var.name = name
+        var.attrs.update(_CF[name])
         return var
 
     def u(self):
@@ -126,10 +201,7 @@ class VectorWind(object):
             u = w.u()
 
         """
-        u = self._metadata(self._api.u, 'u',
-                           units='m s**-1',
-                           standard_name='eastward_wind',
-                           long_name='eastward_component_of_wind')
+        u = self._metadata(self._api.u, 'u')
         return u
 
     def v(self):
@@ -147,10 +219,7 @@ class VectorWind(object):
             v = w.v()
 
         """
-        v = self._metadata(self._api.v, 'v',
-                           units='m s**-1',
-                           standard_name='northward_wind',
-                           long_name='northward_component_of_wind')
+        v = self._metadata(self._api.v, 'v')
         return v
 
     def magnitude(self):
@@ -169,10 +238,7 @@ class VectorWind(object):
 
         """
         m = self._api.magnitude()
-        m = self._metadata(m, 'speed',
-                           units='m s**-1',
-                           standard_name='wind_speed',
-                           long_name='wind_speed')
+        m = self._metadata(m, 'speed')
         return m
 
     def vrtdiv(self, truncation=None):
@@ -206,14 +272,8 @@ class VectorWind(object):
 
         """
         vrt, div = self._api.vrtdiv(truncation=truncation)
-        vrt = self._metadata(vrt, 'vorticity',
-                             units='s**-1',
-                             standard_name='atmosphere_relative_vorticity',
-                             long_name='relative_vorticity')
-        div = self._metadata(div, 'divergence',
-                             units='s**-1',
-                             standard_name='divergence_of_wind',
-                             long_name='horizontal_divergence')
+        vrt = self._metadata(vrt, 'vorticity')
+        div = self._metadata(div, 'divergence')
         return vrt, div
 
     def vorticity(self, truncation=None):
@@ -247,10 +307,7 @@ class VectorWind(object):
 
         """
         vrt = self._api.vorticity(truncation=truncation)
-        vrt = self._metadata(vrt, 'vorticity',
-                             units='s**-1',
-                             standard_name='atmosphere_relative_vorticity',
-                             long_name='relative_vorticity')
+        vrt = self._metadata(vrt, 'vorticity')
         return vrt
 
     def divergence(self, truncation=None):
@@ -284,10 +341,7 @@ class VectorWind(object):
 
         """
         div = self._api.divergence(truncation=truncation)
-        div = self._metadata(div, 'divergence',
-                             units='s**-1',
-                             standard_name='divergence_of_wind',
-                             long_name='horizontal_divergence')
+        div = self._metadata(div, 'divergence')
         return div
 
     def planetaryvorticity(self, omega=None):
@@ -302,7 +356,8 @@ class VectorWind(object):
         **Returns:**
 
         *pvorticity*
-            The planetary vorticity.
+            The planetary vorticity. This has the same precision as
+            the input winds (double precision for integer winds).
 
         **See also:**
 
@@ -320,11 +375,7 @@ class VectorWind(object):
 
         """
         f = self._api.planetaryvorticity(omega=omega)
-        f = self._metadata(
-            f, 'coriolis',
-            units='s**-1',
-            standard_name='coriolis_parameter',
-            long_name='planetary_vorticity')
+        f = self._metadata(f, 'coriolis')
         return f
 
     def absolutevorticity(self, omega=None, truncation=None):
@@ -343,7 +394,9 @@ class VectorWind(object):
         **Returns:**
 
         *avorticity*
-            The absolute (relative + planetary) vorticity.
+            The absolute (relative + planetary) vorticity. This is
+            single precision for single precision input winds and
+            double precision otherwise.
 
         **See also:**
 
@@ -363,10 +416,7 @@ class VectorWind(object):
 
         """
         avrt = self._api.absolutevorticity(omega=omega, truncation=truncation)
-        avrt = self._metadata(avrt, 'absolute_vorticity',
-                              units='s**-1',
-                              standard_name='atmosphere_absolute_vorticity',
-                              long_name='absolute_vorticity')
+        avrt = self._metadata(avrt, 'absolute_vorticity')
         return avrt
 
     def sfvp(self, truncation=None):
@@ -400,16 +450,8 @@ class VectorWind(object):
 
         """
         sf, vp = self._api.sfvp(truncation=truncation)
-        sf = self._metadata(
-            sf, 'streamfunction',
-            units='m**2 s**-1',
-            standard_name='atmosphere_horizontal_streamfunction',
-            long_name='streamfunction')
-        vp = self._metadata(
-            vp, 'velocity_potential',
-            units='m**2 s**-1',
-            standard_name='atmosphere_horizontal_velocity_potential',
-            long_name='velocity potential')
+        sf = self._metadata(sf, 'streamfunction')
+        vp = self._metadata(vp, 'velocity_potential')
         return sf, vp
 
     def streamfunction(self, truncation=None):
@@ -443,11 +485,7 @@ class VectorWind(object):
 
         """
         sf = self._api.streamfunction(truncation=truncation)
-        sf = self._metadata(
-            sf, 'streamfunction',
-            units='m**2 s**-1',
-            standard_name='atmosphere_horizontal_streamfunction',
-            long_name='streamfunction')
+        sf = self._metadata(sf, 'streamfunction')
         return sf
 
     def velocitypotential(self, truncation=None):
@@ -481,11 +519,7 @@ class VectorWind(object):
 
         """
         vp = self._api.velocitypotential(truncation=truncation)
-        vp = self._metadata(
-            vp, 'velocity_potential',
-            units='m**2 s**-1',
-            standard_name='atmosphere_horizontal_velocity_potential',
-            long_name='velocity potential')
+        vp = self._metadata(vp, 'velocity_potential')
         return vp
 
     def helmholtz(self, truncation=None):
@@ -522,18 +556,10 @@ class VectorWind(object):
 
         """
         uchi, vchi, upsi, vpsi = self._api.helmholtz(truncation=truncation)
-        uchi = self._metadata(uchi, 'u_chi',
-                              units='m s**-1',
-                              long_name='irrotational_eastward_wind')
-        vchi = self._metadata(vchi, 'v_chi',
-                              units='m s**-1',
-                              long_name='irrotational_northward_wind')
-        upsi = self._metadata(upsi, 'u_psi',
-                              units='m s**-1',
-                              long_name='non_divergent_eastward_wind')
-        vpsi = self._metadata(vpsi, 'v_psi',
-                              units='m s**-1',
-                              long_name='non_divergent_northward_wind')
+        uchi = self._metadata(uchi, 'u_chi')
+        vchi = self._metadata(vchi, 'v_chi')
+        upsi = self._metadata(upsi, 'u_psi')
+        vpsi = self._metadata(vpsi, 'v_psi')
         return uchi, vchi, upsi, vpsi
 
     def irrotationalcomponent(self, truncation=None):
@@ -573,12 +599,8 @@ class VectorWind(object):
 
         """
         uchi, vchi = self._api.irrotationalcomponent(truncation=truncation)
-        uchi = self._metadata(uchi, 'u_chi',
-                              units='m s**-1',
-                              long_name='irrotational_eastward_wind')
-        vchi = self._metadata(vchi, 'v_chi',
-                              units='m s**-1',
-                              long_name='irrotational_northward_wind')
+        uchi = self._metadata(uchi, 'u_chi')
+        vchi = self._metadata(vchi, 'v_chi')
         return uchi, vchi
 
     def nondivergentcomponent(self, truncation=None):
@@ -618,14 +640,53 @@ class VectorWind(object):
 
         """
         upsi, vpsi = self._api.nondivergentcomponent(truncation=truncation)
-        upsi = self._metadata(upsi, 'u_psi',
-                              units='m s**-1',
-                              long_name='non_divergent_eastward_wind')
-        vpsi = self._metadata(vpsi, 'v_psi',
-                              units='m s**-1',
-                              long_name='non_divergent_northward_wind')
+        upsi = self._metadata(upsi, 'u_psi')
+        vpsi = self._metadata(vpsi, 'v_psi')
         return upsi, vpsi
 
+    def diagnostics(self, truncation=None, which=None):
+        """Several diagnostics computed from one analysis of the wind.
+
+        **Optional arguments:**
+
+        *truncation*
+            Truncation limit (triangular truncation) for the spherical
+            harmonic computation.
+
+        *which*
+            The name of a diagnostic, or an iterable containing the
+            names of the diagnostics to compute, any of 'vrt'
+            (relative vorticity), 'div' (divergence), 'sf'
+            (streamfunction), 'vp' (velocity potential), 'uchi', 'vchi'
+            (irrotational components), 'upsi' and 'vpsi' (non-divergent
+            components). Defaults to all of these diagnostics.
+
+        **Returns:**
+
+        *diagnostics*
+            A dictionary mapping each requested name to a `~xarray.DataArray`.
+
+        **See also:**
+
+        `~VectorWind.vrtdiv`, `~VectorWind.sfvp`,
+        `~VectorWind.helmholtz`.
+
+        **Examples:**
+
+        Compute all the diagnostics::
+
+            diags = w.diagnostics()
+            vrt = diags['vrt']
+
+        Compute the streamfunction and the non-divergent wind components
+        with spectral truncation at triangular T13::
+
+            diags = w.diagnostics(truncation=13,
+                                  which=('sf', 'upsi', 'vpsi'))
+
+        """
+        return get_diagnostics(self, truncation=truncation, which=which)
+
     def gradient(self, chi, truncation=None):
         """Computes the vector gradient of a scalar field on the sphere.
 
@@ -646,7 +707,8 @@ class VectorWind(object):
 
         *uchi*, *vchi*
             The zonal and meridional components of the vector gradient
-            respectively.
+            respectively. These have the same coordinates as *chi*,
+            including any non-dimension coordinates.
 
         **Examples:**
 
@@ -670,25 +732,22 @@ class VectorWind(object):
         if (lat.values[0] < lat.values[1]):
             # need to reverse latitude dimension
             chi = _reverse(chi, lat_dim)
-            lat, lat_dim = _find_latitude_coordinate(chi)
-        apiorder, _ = get_apiorder(chi.ndim, lat_dim, lon_dim)
-        apiorder = [chi.dims[i] for i in apiorder]
-        reorder = chi.dims
-        chi = chi.copy().transpose(*apiorder)
-        ishape = chi.shape
-        coords = [chi.coords[n] for n in chi.dims]
-        chi = to3d(chi.values)
-        uchi, vchi = self._api.gradient(chi, truncation=truncation)
-        uchi = uchi.reshape(ishape)
-        vchi = vchi.reshape(ishape)
+        apiorder, inv_perm = get_apiorder(chi.ndim, lat_dim, lon_dim)
+        chidata = chi.values.transpose(apiorder)
+        ishape = chidata.shape
+        uchi, vchi = self._api.gradient(to3d(chidata), truncation=truncation)
+        # The outputs are on the same grid as the input, so they are made by
+        # copying the input with new data rather than building new arrays.
         uchi_name = 'zonal_gradient_of_{!s}'.format(name)
         vchi_name = 'meridional_gradient_of_{!s}'.format(name)
-        uchi = xr.DataArray(uchi, coords=coords, name=uchi_name,
-                            attrs={'long_name': uchi_name})
-        vchi = xr.DataArray(vchi, coords=coords, name=vchi_name,
-                            attrs={'long_name': vchi_name})
-        uchi = uchi.transpose(*reorder)
-        vchi = vchi.transpose(*reorder)
+        uchi = chi.copy(deep=False,
+                        data=uchi.reshape(ishape).transpose(inv_perm))
+        vchi = chi.copy(deep=False,
+                        data=vchi.reshape(ishape).transpose(inv_perm))
+        uchi.name = uchi_name
+        uchi.attrs = {'long_name': uchi_name}
+        vchi.name = vchi_name
+        vchi.attrs = {'long_name': vchi_name}
         return uchi, vchi
 
     def truncate(self, field, truncation=None):
@@ -735,24 +794,18 @@ class VectorWind(object):
         if (lat.values[0] < lat.values[1]):
             # need to reverse latitude dimension
             field = _reverse(field, lat_dim)
-            lat, lat_dim = _find_latitude_coordinate(field)
-        apiorder, _ = get_apiorder(field.ndim, lat_dim, lon_dim)
-        apiorder = [field.dims[i] for i in apiorder]
-        reorder = field.dims
-        field = field.copy().transpose(*apiorder)
-        ishape = field.shape
-        fielddata = to3d(field.values)
-        fieldtrunc = self._api.truncate(fielddata, truncation=truncation)
-        field.values = fieldtrunc.reshape(ishape)
-        field = field.transpose(*reorder)
+        apiorder, inv_perm = get_apiorder(field.ndim, lat_dim, lon_dim)
+        fielddata = field.values.transpose(apiorder)
+        ishape = fielddata.shape
+        fieldtrunc = self._api.truncate(to3d(fielddata), truncation=truncation)
+        field = field.copy(deep=False,
+                           data=fieldtrunc.reshape(ishape).transpose(inv_perm))
         return field
 
 
 def _reverse(array, dim):
     """Reverse an `xarray.DataArray` along a given dimension."""
-    slicers = [slice(0, None)] * array.ndim
-    slicers[dim] = slice(-1, None, -1)
-    return array[tuple(slicers)]
+    return array.isel({array.dims[dim]: slice(None, None, -1)})
 
 
 def _find_coord_and_dim(array, predicate, name):
@@ -761,17 +814,17 @@ def _find_coord_and_dim(array, predicate, name):
     a predicate function.
 
     """
-    candidates = [coord
-                  for coord in [array.coords[n] for n in array.dims]
-                  if predicate(coord)]
-    if not candidates:
+    found = None
+    for dim, dim_name in enumerate(array.dims):
+        coord = array.coords[dim_name]
+        if predicate(coord):
+            if found is not None:
+                msg = 'multiple {!s} coordinates are not allowed'
+                raise ValueError(msg.format(name))
+            found = coord, dim
+    if found is None:
         raise ValueError('cannot find a {!s} coordinate'.format(name))
-    if len(candidates) > 1:
-        msg = 'multiple {!s} coordinates are not allowed'
-        raise ValueError(msg.format(name))
-    coord = candidates[0]
-    dim = array.dims.index(coord.name)
-    return coord, dim
+    return found
 
 
 def _find_latitude_coordinate(array):